@@ -0,0 +1,54 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Opcjonalne rozszerzenie Cython z testem punktów w wielokącie (ray casting).
+
+Kompilacja (w katalogu projektu):
+    cythonize -i _pip.pyx
+
+Rozszerzenie jest używane przez triangulation, gdy Numba nie jest zainstalowana.
+Bez niego obliczenia wykonuje NumPy.
+"""
+
+import numpy as np
+
+
+cpdef points_in_polygon(const double[:, ::1] points, const double[:, ::1] edges):
+    """
+    Test ray casting dla wielu punktów i wielokąta zapisanego jako tablica.
+
+    Warunek przecięcia krawędzi odpowiada ImageTriangulation.point_in_polygon
+    (dolny koniec krawędzi wyłączony, górny włączony, punkt na krawędzi wewnątrz).
+
+    Args:
+        points: Punkty do sprawdzenia jako tablica (m, 2) float64
+        edges: Krawędzie wielokąta (x0, y0, dx, dy) jako tablica (n, 4) float64
+
+    Returns:
+        numpy.ndarray: Tablica bool (m,) - True dla punktów wewnątrz wielokąta
+    """
+    cdef Py_ssize_t k, i
+    cdef Py_ssize_t n = edges.shape[0]
+    cdef double px, py, y0, dy, side
+    cdef bint inside
+
+    result = np.empty(points.shape[0], dtype=np.uint8)
+    cdef unsigned char[::1] out = result
+
+    with nogil:
+        for k in range(points.shape[0]):
+            px = points[k, 0]
+            py = points[k, 1]
+            inside = False
+
+            for i in range(n):
+                y0 = edges[i, 1]
+                dy = edges[i, 3]
+                # Krawędź przecina poziomą prostą przez punkt (poziome krawędzie nigdy)
+                if (y0 < py) != (y0 + dy < py):
+                    # Punkt na lewo od przecięcia (lub na nim) - porównanie bez dzielenia
+                    side = (px - edges[i, 0]) * dy - (py - y0) * edges[i, 2]
+                    if (side <= 0) if dy > 0 else (side >= 0):
+                        inside = not inside
+            out[k] = inside
+
+    return result.view(np.bool_)
@@ -5,8 +5,11 @@ Moduł zawierający klasę ColoringGame - główną grę kolorowanki z triangula
 import numpy as np
 import cv2
 import os
-import glob
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from triangulation import ImageTriangulation
+from utils import save_result
 
 
 class ColoringGame:
@@ -15,9 +18,13 @@ class ColoringGame:
     Umożliwia wybór obrazu, kolorów i interaktywne kolorowanie trójkątów.
     """
 
-    def __init__(self):
+    def __init__(self, image_files=None, dir_mtime=None):
         """
         Inicjalizuje grę kolorowanki z domyślnymi ustawieniami.
+
+        Args:
+            image_files (list): Lista plików obrazów znaleziona wcześniej w bieżącym katalogu (opcjonalna)
+            dir_mtime (int): Czas modyfikacji katalogu (st_mtime_ns) z chwili utworzenia listy
         """
         # Utwórz instancję triangulacji z odpowiednimi parametrami
         self.triangulator = ImageTriangulation()
@@ -98,22 +105,64 @@ class ColoringGame:
             (25, 25, 112),  # Nocny niebieski
         ]
 
+        # Paleta jako tablica uint8 (N, 3) do szybkiego indeksowania i operacji wektorowych
+        self._colors_np = np.asarray(self.colors, dtype=np.uint8)
+
         # Indeks aktualnie wybranego koloru
         self.current_color_index = 0
         # Aktualnie wybrany kolor
-        self.current_color = self.colors[self.current_color_index]
+        self.current_color = self._color(self.current_color_index)
+
+        # Układ palety w oknie wyboru koloru
+        self.palette_color_width = 40  # Szerokość próbki koloru
+        self.palette_color_height = 60  # Wysokość próbki koloru
+        self.palette_colors_per_row = 12  # Liczba kolorów w jednym rzędzie
+
+        # Gotowy obraz palety bez zaznaczenia (rysowany raz) i prostokąty próbek
+        self._palette_cells = []
+        self._palette_base = self._create_palette_base()
+
+        # Okno kontroli gęstości: suwaki OpenCV (trackbar) i obraz z instrukcjami
+        self.contour_trackbar = "Punkty konturu"
+        self.interior_trackbar = "Gestosc wewnetrzna"
+        self._density_base = None  # Obraz okna z instrukcjami (tworzony przy pierwszym wyświetleniu)
+        # Czas ostatniej zmiany suwaka, po której siatka nie została jeszcze przeliczona
+        self._density_changed_at = None
+        self.density_debounce = 0.3  # Sekundy bez zmian suwaka przed przeliczeniem siatki
 
         # Dane obrazu
         self.original_image = None  # Oryginalny obraz
         self.display_image = None  # Obraz wyświetlany z triangulacją
-        self.triangles = []  # Lista wszystkich trójkątów
+        self._clean_display = None  # Obraz z triangulacją przed kolorowaniem
+        self.tri_xy = np.empty((0, 3, 2), dtype=np.int32)  # Wierzchołki wszystkich trójkątów jako tablica (N, 3, 2)
+        self.tri_bbox = np.empty((0, 4), dtype=np.int32)  # Prostokąty otaczające (x_min, y_min, x_max, y_max)
+        self.triangle_id_map = None  # Mapa pikseli -> indeks trójkąta (-1 poza trójkątami)
+
+        # Wyniki pośrednie przetwarzania bieżącego obrazu (ponownie używane przy zmianie gęstości)
+        self._contours_source = None  # Obraz, dla którego wyznaczono kontury
+        self._contours = []  # Kontury obrazu
+        self._contour_points_cache = {}  # Liczba punktów konturu -> punkty na konturach
+        self._triangulation_cache = OrderedDict()  # (punkty konturu, gęstość wewnętrzna) -> tablica trójkątów
+        self.triangulation_cache_size = 4  # Liczba zapamiętanych triangulacji (najdawniej użyte są usuwane)
         self.triangle_colors = {}  # Słownik przechowujący kolory trójkątów (indeks -> kolor)
+        self._paint_history = []  # Historia kolorowania do cofania: (indeks, poprzedni kolor lub None, nowy kolor)
 
         # Nazwy okien (z polskimi znakami)
         self.main_window = "Kolorowanka"
         self.color_window = "Wybór koloru"
         self.image_select_window = "Wybór obrazu"
         self.density_window = "Gęstość siatki"
+        self._main_window_flags = None  # Flagi głównego okna (ustalane przy pierwszym otwarciu)
+
+        # Zapamiętana lista plików obrazów w bieżącym katalogu i czas modyfikacji
+        # katalogu, dla którego jest aktualna
+        self._image_files_cache = image_files if dir_mtime is not None else None
+        self._image_files_mtime = dir_mtime
+        # Obrazy zdekodowane przy tworzeniu miniatur (ścieżka -> obraz źródłowy)
+        self._decoded_images = {}
+
+        # Czas ostatniej aktywności użytkownika (mysz lub klawiatura)
+        self._last_event = time.monotonic()
 
         # Flagi stanu aplikacji
         self.running = True  # Czy aplikacja jest uruchomiona
@@ -122,6 +171,19 @@ class ColoringGame:
         # Ustawienie kodowania dla polskich znaków w OpenCV
         self._setup_polish_encoding()
 
+    def _color(self, index):
+        """
+        Zwraca kolor z palety w postaci akceptowanej przez funkcje rysujące OpenCV.
+
+        Args:
+            index (int): Indeks koloru w palecie
+
+        Returns:
+            tuple: Kolor w formacie BGR jako krotka liczb całkowitych
+        """
+        b, g, r = self._colors_np[index].tolist()
+        return b, g, r
+
     def _setup_polish_encoding(self):
         """
         Konfiguruje obsługę polskich znaków w OpenCV.
@@ -141,13 +203,38 @@ class ColoringGame:
         Returns:
             list: Lista nazw plików obrazów
         """
-        # Wyszukaj pliki z rozszerzeniami obrazów
-        image_files = (glob.glob("*.jpg") +
-                       glob.glob("*.jpeg") +
-                       glob.glob("*.png") +
-                       glob.glob("*.bmp") +
-                       glob.glob("*.tiff"))
-        return image_files
+        # Wynik jest zapamiętywany - katalog przeglądamy ponownie tylko wtedy,
+        # gdy zmienił się czas jego modyfikacji (dodano lub usunięto pliki)
+        dir_mtime = os.stat('.').st_mtime_ns
+        if self._image_files_cache is None or dir_mtime != self._image_files_mtime:
+            # Jedno przejście po katalogu zamiast osobnego glob dla każdego rozszerzenia
+            extensions = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff')
+            with os.scandir('.') as entries:
+                self._image_files_cache = [entry.name for entry in entries
+                                           if entry.is_file() and
+                                           entry.name.lower().endswith(extensions)]
+            self._image_files_mtime = dir_mtime
+        return self._image_files_cache
+
+    def _load_thumbnail(self, image_path):
+        """
+        Wczytuje obraz i zmniejsza go do miniatury 120x80 pikseli.
+
+        Zdekodowany obraz jest zapamiętywany, aby po wyborze nie dekodować pliku
+        ponownie w load_image (skalowanie do rozmiaru okna odbywa się dopiero tam,
+        tylko dla wybranego obrazu).
+
+        Args:
+            image_path (str): Ścieżka do pliku obrazu
+
+        Returns:
+            numpy.ndarray: Miniatura lub None jeśli obrazu nie można wczytać
+        """
+        img = cv2.imread(image_path)
+        if img is None:
+            return None
+        self._decoded_images[image_path] = img
+        return cv2.resize(img, (120, 80))
 
     def create_image_selection_window(self, image_files):
         """
@@ -171,35 +258,33 @@ class ColoringGame:
         # Utwórz jasnoszare tło dla okna
         selection_image = np.ones((window_height, window_width, 3), dtype=np.uint8) * 240
 
-        # Wczytaj i umieść miniatury obrazów
-        thumbnails = []
+        # Wczytaj miniatury równolegle - OpenCV zwalnia GIL podczas dekodowania i skalowania
         max_images = min(len(image_files), 8)  # Ogranicz liczbę wyświetlanych miniatur
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            thumbnails = list(pool.map(self._load_thumbnail, image_files[:max_images]))
+
+        # Złóż wszystkie miniatury (z odstępami 15 px po bokach) w jeden pasek
+        # i skopiuj go do okna jedną operacją
+        padding = np.full((80, 15, 3), 240, dtype=np.uint8)
+        empty = np.full((80, 120, 3), 240, dtype=np.uint8)  # Miejsce po nieudanym wczytaniu
+        strip = np.concatenate([part for thumbnail in thumbnails
+                                for part in (padding, empty if thumbnail is None else thumbnail, padding)],
+                               axis=1)
+        selection_image[10:10 + 80, :strip.shape[1]] = strip
+
+        # Dodaj nazwy plików pod miniaturami (obetnij długie nazwy)
+        for i, thumbnail in enumerate(thumbnails):
+            if thumbnail is None:
+                continue
 
-        for i in range(max_images):
-            file = image_files[i]
-            img = cv2.imread(file)
-            if img is not None:
-                # Zmień rozmiar obrazu do miniatury (120x80 pikseli)
-                thumbnail = cv2.resize(img, (120, 80))
-                thumbnails.append(thumbnail)
-
-                # Oblicz pozycję miniatury w oknie
-                x_offset = i * 150 + 15
-
-                # Sprawdź czy miniatura mieści się w oknie
-                if x_offset + 120 <= window_width:
-                    # Umieść miniaturę w oknie wyboru
-                    selection_image[10:10 + 80, x_offset:x_offset + 120] = thumbnail
-
-                    # Dodaj nazwę pliku pod miniaturą (obetnij długie nazwy)
-                    filename = os.path.basename(file)
-                    if len(filename) > 15:
-                        filename = filename[:12] + "..."
+            filename = os.path.basename(image_files[i])
+            if len(filename) > 15:
+                filename = filename[:12] + "..."
 
-                    # Napisz nazwę pliku używając standardowej czcionki
-                    cv2.putText(selection_image, filename,
-                                (x_offset, window_height - 10),
-                                cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
+            # Napisz nazwę pliku używając standardowej czcionki
+            cv2.putText(selection_image, filename,
+                        (i * 150 + 15, window_height - 10),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
 
         # Wyświetl okno wyboru
         cv2.imshow(self.image_select_window, selection_image)
@@ -229,9 +314,18 @@ class ColoringGame:
         cv2.setMouseCallback(self.image_select_window, select_image)
 
         # Czekaj na wybór obrazu lub zamknięcie okna
-        while (not self.image_selected and
-               cv2.getWindowProperty(self.image_select_window, cv2.WND_PROP_VISIBLE) >= 1):
+        # (stan okna sprawdzany raz na sekundę zamiast przy każdym obiegu pętli)
+        next_close_check = 0.0
+        while not self.image_selected:
             cv2.waitKey(100)  # Sprawdzaj co 100ms
+            now = time.monotonic()
+            if now >= next_close_check and not self.image_selected:
+                if cv2.getWindowProperty(self.image_select_window, cv2.WND_PROP_VISIBLE) < 1:
+                    break
+                next_close_check = now + 1.0
+
+        # Obrazy wczytane dla miniatur nie są już potrzebne
+        self._decoded_images = {}
 
         return self.image_selected
 
@@ -240,7 +334,15 @@ class ColoringGame:
         Wyświetla obraz w głównym oknie z zachowaniem stałego rozmiaru okna.
         """
         # Upewnij się, że okno ma odpowiednie właściwości
-        cv2.namedWindow(self.main_window, cv2.WINDOW_NORMAL)
+        if self._main_window_flags is None:
+            # Przy pierwszym otwarciu spróbuj okna OpenGL (obraz jako tekstura GPU);
+            # OpenCV bez obsługi OpenGL zgłasza błąd - wtedy zwykłe okno
+            try:
+                cv2.namedWindow(self.main_window, cv2.WINDOW_NORMAL | cv2.WINDOW_OPENGL)
+                self._main_window_flags = cv2.WINDOW_NORMAL | cv2.WINDOW_OPENGL
+            except cv2.error:
+                self._main_window_flags = cv2.WINDOW_NORMAL
+        cv2.namedWindow(self.main_window, self._main_window_flags)
         # Ustaw stały rozmiar okna
         cv2.resizeWindow(self.main_window, self.window_width, self.window_height)
         # Wyświetl obraz
@@ -256,14 +358,17 @@ class ColoringGame:
         Returns:
             bool: True jeśli obraz został pomyślnie wczytany
         """
-        # Wczytaj obraz z dysku
-        self.original_image = cv2.imread(image_path)
-        if self.original_image is None:
-            print(f"Nie można wczytać obrazu: {image_path}")
-            return False
+        # Użyj obrazu zdekodowanego już przy tworzeniu miniatur (jeśli jest)
+        image = self._decoded_images.pop(image_path, None)
+        if image is None:
+            # Wczytaj obraz z dysku
+            image = cv2.imread(image_path)
+            if image is None:
+                print(f"Nie można wczytać obrazu: {image_path}")
+                return False
 
         # Zmień rozmiar obrazu do standardowego rozmiaru okna
-        self.original_image = cv2.resize(self.original_image, (self.window_width, self.window_height))
+        self.original_image = cv2.resize(image, (self.window_width, self.window_height))
 
         # Przetwórz obraz i utwórz triangulację
         self.process_image()
@@ -279,52 +384,132 @@ class ColoringGame:
         if self.original_image is None:
             return False
 
-        # Znajdź kontury w obrazie używając triangulacji
-        contours = self.triangulator.get_contours_from_image(self.original_image)
+        # Bieżące parametry gęstości są stosowane teraz - oczekujące przeliczenie
+        # po zmianie suwaka nie jest już potrzebne
+        self._density_changed_at = None
+
+        # Kontury zależą tylko od obrazu
+        self._compute_contours()
+
+        # Triangulacja zależy tylko od parametrów gęstości - przy powrocie
+        # do wcześniej użytych wartości wykorzystaj zapamiętany wynik
+        n_contour_points = self.triangulator.n_contour_points
+        params = (n_contour_points, self.triangulator.interior_density)
+        tri_xy = self._triangulation_cache.get(params)
+        if tri_xy is None:
+            tri_xy = self._triangulate_contours(n_contour_points)
+            self._triangulation_cache[params] = tri_xy
+            # Usuń najdawniej użyte triangulacje ponad limit
+            while len(self._triangulation_cache) > self.triangulation_cache_size:
+                self._triangulation_cache.popitem(last=False)
+        else:
+            self._triangulation_cache.move_to_end(params)
+        self.tri_xy = tri_xy
+
+        # Utwórz kopię obrazu do wyświetlania i narysuj na niej linie triangulacji
+        self.display_image = self._copy_into(self.display_image, self.original_image)
+        self.triangulator.draw_delaunay_triangles(
+            self.display_image, self.tri_xy, self.triangulator.triangle_color)
+
+        # Prostokąty otaczające trójkąty (obszar odtwarzany przy cofaniu kolorowania)
+        self.tri_bbox = np.concatenate([self.tri_xy.min(axis=1), self.tri_xy.max(axis=1)], axis=1)
+        # Narysuj mapę indeksów trójkątów do wyszukiwania kliknięć
+        self.build_triangle_id_map()
+
+        # Zapamiętaj niepokolorowany obraz z triangulacją do szybkiego resetu
+        self._clean_display = self._copy_into(self._clean_display, self.display_image)
 
-        # Utwórz kopię obrazu do wyświetlania z triangulacją
-        self.display_image = self.original_image.copy()
-        self.triangles = []  # Wyczyść listę trójkątów
+        # Zresetuj słownik kolorów trójkątów (usuń poprzednie kolorowanie)
+        self.triangle_colors = {}
+        self._paint_history = []
 
-        # Przetwórz każdy znaleziony kontur
-        for contour in contours:
-            # Rozmieść punkty równomiernie na konturze
-            contour_points = self.triangulator.place_points_on_contour(
-                contour, self.triangulator.n_contour_points)
+        return True
 
-            # Pomiń kontury z niewystarczającą liczbą punktów
-            if len(contour_points) < 3:
-                continue
+    def _copy_into(self, buffer, source):
+        """
+        Kopiuje obraz do istniejącego bufora, jeśli ten ma odpowiedni rozmiar.
 
-            # Generuj punkty wewnętrzne w obszarze konturu
-            interior_points = self.triangulator.generate_interior_points(
-                contour_points, self.original_image.shape)
+        Pozwala uniknąć przydzielania nowej pamięci przy każdym przetworzeniu obrazu.
 
-            # Utwórz triangulację Delaunaya
-            triangles = self.triangulator.create_triangulation(
-                contour_points, interior_points, self.original_image.shape)
+        Args:
+            buffer (numpy.ndarray): Dotychczasowy bufor (lub None)
+            source (numpy.ndarray): Obraz do skopiowania
 
-            # Dodaj nowe trójkąty do głównej listy
-            self.triangles.extend(triangles)
+        Returns:
+            numpy.ndarray: Bufor z kopią obrazu (nowy, jeśli nie można było użyć starego)
+        """
+        if buffer is None or buffer.shape != source.shape or buffer.dtype != source.dtype:
+            return source.copy()
+        np.copyto(buffer, source)
+        return buffer
 
-            # Narysuj linie triangulacji na obrazie wyświetlanym
-            self.triangulator.draw_delaunay_triangles(
-                self.display_image, triangles, self.triangulator.triangle_color)
+    def _compute_contours(self):
+        """
+        Wyznacza kontury bieżącego obrazu, jeśli nie zostały już wyznaczone.
 
-        # Zresetuj słownik kolorów trójkątów (usuń poprzednie kolorowanie)
-        self.triangle_colors = {}
+        Nowy obraz unieważnia też wszystkie wyniki kolejnych etapów
+        (punkty na konturach i triangulacje).
+        """
+        if self._contours_source is not self.original_image:
+            self._contours = self.triangulator.get_contours_from_image(self.original_image)
+            self._contours_source = self.original_image
+            self._contour_points_cache = {}
+            self._triangulation_cache = OrderedDict()
 
-        return True
+    def _resample_contours(self, n_contour_points):
+        """
+        Zwraca punkty rozmieszczone na zapamiętanych konturach obrazu.
 
-    def create_color_selection_window(self):
+        Punkty zależą tylko od ich liczby, nie od gęstości wewnętrznej, więc
+        zmiana samej gęstości korzysta z zapamiętanego wyniku.
+
+        Args:
+            n_contour_points (int): Liczba punktów na każdym konturze
+
+        Returns:
+            list: Punkty kolejnych konturów
         """
-        Tworzy okno wyboru koloru z paletą dostępnych kolorów.
-        Każdy kolor jest reprezentowany jako kolorowy prostokąt.
+        all_contour_points = self._contour_points_cache.get(n_contour_points)
+        if all_contour_points is None:
+            all_contour_points = [self.triangulator.place_points_on_contour(contour, n_contour_points)
+                                  for contour in self._contours]
+            self._contour_points_cache[n_contour_points] = all_contour_points
+        return all_contour_points
+
+    def _triangulate_contours(self, n_contour_points):
+        """
+        Tworzy triangulację Delaunaya wszystkich zapamiętanych konturów obrazu.
+
+        Args:
+            n_contour_points (int): Liczba punktów rozmieszczanych na każdym konturze
+
+        Returns:
+            numpy.ndarray: Wierzchołki wszystkich trójkątów jako tablica (N, 3, 2) int32
+        """
+        # Kontury są niezależne - triangulator przetwarza je równolegle
+        results = self.triangulator.triangulate_contours(
+            self._resample_contours(n_contour_points), self.original_image.shape)
+
+        # Trójkąty kolejnych konturów jako tablice (n, 3, 2), pomijając kontury
+        # z niewystarczającą liczbą punktów
+        triangle_arrays = [triangles for _, triangles in filter(None, results)]
+
+        # Połącz trójkąty wszystkich konturów w jedną ciągłą tablicę (N, 3, 2)
+        if triangle_arrays:
+            return np.concatenate(triangle_arrays, axis=0)
+        return np.empty((0, 3, 2), dtype=np.int32)
+
+    def _create_palette_base(self):
+        """
+        Rysuje obraz palety kolorów bez zaznaczenia wybranego koloru.
+        Obraz jest tworzony raz, a przy zmianie wyboru tylko kopiowany.
+
+        Returns:
+            numpy.ndarray: Obraz palety kolorów
         """
-        # Oblicz wymiary okna (wysokość stała, szerokość zależy od liczby kolorów)
-        color_height = 60
-        color_width = 40
-        colors_per_row = 12  # Liczba kolorów w jednym rzędzie
+        color_height = self.palette_color_height
+        color_width = self.palette_color_width
+        colors_per_row = self.palette_colors_per_row
 
         # Oblicz liczbę rzędów potrzebnych do wyświetlenia wszystkich kolorów
         rows = (len(self.colors) + colors_per_row - 1) // colors_per_row
@@ -334,29 +519,52 @@ class ColoringGame:
         window_height = rows * color_height + 30  # Dodatkowe miejsce na tekst
 
         # Utwórz jasnoszare tło
-        color_image = np.ones((window_height, window_width, 3), dtype=np.uint8) * 240
-
-        # Narysuj próbki kolorów w siatce
-        for i, color in enumerate(self.colors):
-            # Oblicz pozycję koloru w siatce
-            row = i // colors_per_row
-            col = i % colors_per_row
-
-            # Oblicz współrzędne prostokąta
-            x_start = col * color_width
-            y_start = row * color_height
-            x_end = x_start + color_width
-            y_end = y_start + color_height
-
-            # Narysuj kolorowy prostokąt
-            cv2.rectangle(color_image, (x_start, y_start), (x_end, y_end), color, -1)
-
-            # Zaznacz aktualnie wybrany kolor czarną ramką
-            if i == self.current_color_index:
-                cv2.rectangle(color_image, (x_start, y_start), (x_end, y_end), (0, 0, 0), 3)
-            else:
-                # Narysuj cienką szarą ramkę wokół innych kolorów
-                cv2.rectangle(color_image, (x_start, y_start), (x_end, y_end), (100, 100, 100), 1)
+        palette_image = np.ones((window_height, window_width, 3), dtype=np.uint8) * 240
+
+        # Zapamiętaj prostokąty próbek (do zaznaczania wybranego koloru)
+        self._palette_cells = []
+        for i in range(len(self.colors)):
+            x_start = (i % colors_per_row) * color_width
+            y_start = (i // colors_per_row) * color_height
+            self._palette_cells.append((x_start, y_start,
+                                        x_start + color_width, y_start + color_height))
+
+        # Wypełnij wszystkie próbki naraz: kolory (uzupełnione tłem do pełnej siatki)
+        # rozciągnięte do rozmiaru próbki
+        n_empty = rows * colors_per_row - len(self.colors)
+        tiles = np.vstack([self._colors_np, np.full((n_empty, 3), 240, dtype=np.uint8)])
+        tiles = tiles.reshape(rows, colors_per_row, 3)
+        grid_height = rows * color_height
+        palette_image[:grid_height] = np.repeat(np.repeat(tiles, color_height, axis=0),
+                                                color_width, axis=1)
+
+        # Narysuj cienkie szare linie siatki między próbkami
+        palette_image[0:grid_height + 1:color_height] = (100, 100, 100)
+        palette_image[:grid_height + 1, 0::color_width] = (100, 100, 100)
+
+        # Usuń linie z pustych pól w ostatnim rzędzie
+        if n_empty:
+            x_empty = (colors_per_row - n_empty) * color_width
+            palette_image[grid_height - color_height + 1:grid_height + 1, x_empty + 1:] = 240
+
+        return palette_image
+
+    def create_color_selection_window(self):
+        """
+        Tworzy okno wyboru koloru z paletą dostępnych kolorów.
+        Każdy kolor jest reprezentowany jako kolorowy prostokąt.
+        """
+        color_height = self.palette_color_height
+        color_width = self.palette_color_width
+        colors_per_row = self.palette_colors_per_row
+
+        # Skopiuj gotową paletę zamiast rysować wszystkie próbki od nowa
+        color_image = self._palette_base.copy()
+        window_height = color_image.shape[0]
+
+        # Zaznacz aktualnie wybrany kolor czarną ramką
+        x_start, y_start, x_end, y_end = self._palette_cells[self.current_color_index]
+        cv2.rectangle(color_image, (x_start, y_start), (x_end, y_end), (0, 0, 0), 3)
 
         # Dodaj informację o aktualnie wybranym kolorze
         info_text = f"Wybrany kolor: {self.current_color_index + 1}/{len(self.colors)}"
@@ -372,6 +580,7 @@ class ColoringGame:
             """
             Obsługuje kliknięcie myszy w oknie wyboru koloru.
             """
+            self._last_event = time.monotonic()
             if event == cv2.EVENT_LBUTTONDOWN:  # Lewy przycisk myszy
                 # Oblicz na który kolor kliknięto
                 col = x // color_width
@@ -382,136 +591,91 @@ class ColoringGame:
                 if 0 <= color_index < len(self.colors):
                     # Ustaw nowy wybrany kolor
                     self.current_color_index = color_index
-                    self.current_color = self.colors[self.current_color_index]
+                    self.current_color = self._color(self.current_color_index)
                     # Odśwież okno wyboru koloru aby pokazać nowy wybór
                     self.create_color_selection_window()
 
         # Podłącz funkcję obsługi myszy do okna
         cv2.setMouseCallback(self.color_window, select_color)
 
+    def draw_density_control_window(self):
+        """
+        Wyświetla obraz okna kontroli gęstości z instrukcjami.
+        Wartości parametrów pokazują suwaki OpenCV, więc obraz nie zmienia się
+        i jest rysowany tylko raz.
+        """
+        if self._density_base is None:
+            # Jasnoszare tło z instrukcjami użytkowania
+            density_base = np.full((60, 450, 3), 240, dtype=np.uint8)
+            cv2.putText(density_base, "Przeciagnij suwaki aby zmienic gestosc siatki",
+                        (20, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (100, 100, 100), 1)
+            cv2.putText(density_base, "Uzyj klawiszy + i - lub przeciagnij suwaki",
+                        (20, 45), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (100, 100, 100), 1)
+            self._density_base = density_base
+
+        # Wyświetl okno kontroli gęstości
+        cv2.imshow(self.density_window, self._density_base)
+
     def create_density_control_window(self):
         """
         Tworzy okno kontroli gęstości siatki triangulacji z suwakami.
         Umożliwia interaktywne dostosowanie parametrów triangulacji.
         """
-        # Wymiary okna kontrolnego
-        window_width = 450
-        window_height = 180
-
-        # Utwórz jasnoszare tło
-        density_image = np.ones((window_height, window_width, 3), dtype=np.uint8) * 240
-
-        # Dodaj tytuły dla suwaków
-        cv2.putText(density_image, "Punkty konturu:", (20, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
-        cv2.putText(density_image, "Gestosc wewnetrzna:", (20, 90),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
-
-        # Dodaj aktualne wartości parametrów
-        cv2.putText(density_image, str(self.triangulator.n_contour_points), (380, 30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
-        cv2.putText(density_image, str(self.triangulator.interior_density), (380, 90),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 0, 0), 1)
-
-        # Parametry suwaków
-        slider_width = 280  # Szerokość obszaru suwaka
-        slider_x = 20  # Pozycja X początku suwaka
-        slider_y_contour = 40  # Pozycja Y suwaka punktów konturu
-        slider_y_interior = 100  # Pozycja Y suwaka gęstości wewnętrznej
-
-        # Narysuj tło suwaka dla punktów kontoru
-        cv2.rectangle(density_image, (slider_x, slider_y_contour),
-                      (slider_x + slider_width, slider_y_contour + 12), (200, 200, 200), -1)
-
-        # Oblicz pozycję uchwytu suwaka dla punktów konturu
-        contour_ratio = ((self.triangulator.n_contour_points - self.min_contour_points) /
-                         (self.max_contour_points - self.min_contour_points))
-        contour_pos = int(slider_x + contour_ratio * slider_width)
-
-        # Narysuj uchwyt suwaka dla punktów konturu
-        cv2.rectangle(density_image, (contour_pos - 6, slider_y_contour - 3),
-                      (contour_pos + 6, slider_y_contour + 15), (0, 0, 200), -1)
-
-        # Narysuj tło suwaka dla gęstości wewnętrznej
-        cv2.rectangle(density_image, (slider_x, slider_y_interior),
-                      (slider_x + slider_width, slider_y_interior + 12), (200, 200, 200), -1)
-
-        # Oblicz pozycję uchwytu suwaka dla gęstości wewnętrznej
-        interior_ratio = ((self.triangulator.interior_density - self.min_interior_density) /
-                          (self.max_interior_density - self.min_interior_density))
-        interior_pos = int(slider_x + interior_ratio * slider_width)
-
-        # Narysuj uchwyt suwaka dla gęstości wewnętrznej
-        cv2.rectangle(density_image, (interior_pos - 6, slider_y_interior - 3),
-                      (interior_pos + 6, slider_y_interior + 15), (0, 0, 200), -1)
-
-        # Dodaj instrukcje użytkowania
-        cv2.putText(density_image, "Kliknij i przeciagnij suwaki aby zmienic gestosc siatki",
-                    (20, 140), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (100, 100, 100), 1)
-        cv2.putText(density_image, "Uzyj klawiszy + i - lub przeciagnij suwaki",
-                    (20, 160), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (100, 100, 100), 1)
-
-        # Wyświetl okno kontroli gęstości
-        cv2.imshow(self.density_window, density_image)
+        cv2.namedWindow(self.density_window)
+
+        # Suwaki OpenCV - zmiana wartości tylko zapamiętuje parametr, siatka jest
+        # przeliczana w głównej pętli, gdy suwak przestanie się przesuwać
+        cv2.createTrackbar(self.contour_trackbar, self.density_window,
+                           self.triangulator.n_contour_points, self.max_contour_points,
+                           self._on_contour_points_change)
+        cv2.setTrackbarMin(self.contour_trackbar, self.density_window, self.min_contour_points)
+        cv2.createTrackbar(self.interior_trackbar, self.density_window,
+                           self.triangulator.interior_density, self.max_interior_density,
+                           self._on_interior_density_change)
+        cv2.setTrackbarMin(self.interior_trackbar, self.density_window, self.min_interior_density)
+
+        self.draw_density_control_window()
+
+    def update_density_trackbars(self):
+        """
+        Ustawia suwaki okna kontroli gęstości na aktualne wartości parametrów
+        (np. po zmianie gęstości klawiszami + i -).
+        """
+        cv2.setTrackbarPos(self.contour_trackbar, self.density_window,
+                           self.triangulator.n_contour_points)
+        cv2.setTrackbarPos(self.interior_trackbar, self.density_window,
+                           self.triangulator.interior_density)
 
-        # Zmienne do śledzenia stanu przeciągania suwaków
-        self.dragging_contour = False  # Czy przeciągamy suwak punktów konturu
-        self.dragging_interior = False  # Czy przeciągamy suwak gęstości wewnętrznej
+    def _on_contour_points_change(self, value):
+        """
+        Obsługuje zmianę suwaka liczby punktów na konturze.
 
-        # Funkcja obsługująca myszy w oknie kontroli gęstości
-        def handle_density_control(event, x, y, flags, param):
-            """
-            Obsługuje interakcję z suwakami w oknie kontroli gęstości.
-            """
-            if event == cv2.EVENT_LBUTTONDOWN:  # Naciśnięcie lewego przycisku myszy
-                # Sprawdź czy kliknięto na suwak punktów konturu
-                if (slider_y_contour - 5 <= y <= slider_y_contour + 17 and
-                        slider_x - 10 <= x <= slider_x + slider_width + 10):
-                    self.dragging_contour = True
-
-                # Sprawdź czy kliknięto na suwak gęstości wewnętrznej
-                elif (slider_y_interior - 5 <= y <= slider_y_interior + 17 and
-                      slider_x - 10 <= x <= slider_x + slider_width + 10):
-                    self.dragging_interior = True
-
-            elif event == cv2.EVENT_LBUTTONUP:  # Zwolnienie lewego przycisku myszy
-                # Jeśli zakończono przeciąganie, zastosuj zmiany
-                if self.dragging_contour or self.dragging_interior:
-                    self.dragging_contour = False
-                    self.dragging_interior = False
-                    # Przetwórz obraz ponownie z nowymi parametrami
-                    self.process_image()
-                    # Wyświetl zaktualizowany obraz
-                    self.display_main_window()
+        Args:
+            value (int): Nowa pozycja suwaka
+        """
+        value = max(value, self.min_contour_points)
+        if value != self.triangulator.n_contour_points:
+            self.triangulator.n_contour_points = value
+            self._density_changed()
 
-            elif event == cv2.EVENT_MOUSEMOVE:  # Ruch myszy
-                # Aktualizuj pozycję suwaka podczas przeciągania
-                if self.dragging_contour:
-                    # Ogranicz pozycję X do granic suwaka
-                    slider_x_pos = max(slider_x, min(x, slider_x + slider_width))
-                    # Oblicz nową wartość punktów konturu na podstawie pozycji
-                    ratio = (slider_x_pos - slider_x) / slider_width
-                    new_contour_points = int(self.min_contour_points +
-                                             ratio * (self.max_contour_points - self.min_contour_points))
-                    # Zaktualizuj parametr triangulacji
-                    self.triangulator.n_contour_points = new_contour_points
-                    # Odśwież okno kontroli
-                    self.create_density_control_window()
+    def _on_interior_density_change(self, value):
+        """
+        Obsługuje zmianę suwaka gęstości punktów wewnętrznych.
 
-                elif self.dragging_interior:
-                    # Ogranicz pozycję X do granic suwaka
-                    slider_x_pos = max(slider_x, min(x, slider_x + slider_width))
-                    # Oblicz nową wartość gęstości wewnętrznej
-                    ratio = (slider_x_pos - slider_x) / slider_width
-                    new_interior_density = int(self.min_interior_density +
-                                               ratio * (self.max_interior_density - self.min_interior_density))
-                    # Zaktualizuj parametr triangulacji
-                    self.triangulator.interior_density = new_interior_density
-                    # Odśwież okno kontroli
-                    self.create_density_control_window()
+        Args:
+            value (int): Nowa pozycja suwaka
+        """
+        value = max(value, self.min_interior_density)
+        if value != self.triangulator.interior_density:
+            self.triangulator.interior_density = value
+            self._density_changed()
 
-        # Podłącz funkcję obsługi myszy do okna
-        cv2.setMouseCallback(self.density_window, handle_density_control)
+    def _density_changed(self):
+        """
+        Zapamiętuje czas zmiany parametrów - siatka zostanie przeliczona w głównej
+        pętli dopiero po density_debounce sekundach bez kolejnych zmian.
+        """
+        self._density_changed_at = self._last_event = time.monotonic()
 
     def point_in_triangle(self, point, triangle):
         """
@@ -524,18 +688,15 @@ class ColoringGame:
         Returns:
             bool: True jeśli punkt jest wewnątrz trójkąta
         """
+        # Rozpakuj współrzędne punktu i wierzchołków trójkąta
+        px, py = point
+        (ax, ay), (bx, by), (cx, cy) = triangle
 
-        def sign(p1, p2, p3):
-            """Oblicza znak dla algorytmu punkt-w-trójkącie."""
-            return (p1[0] - p3[0]) * (p2[1] - p3[1]) - (p2[0] - p3[0]) * (p1[1] - p3[1])
-
-        # Rozpakuj wierzchołki trójkąta
-        pt1, pt2, pt3 = triangle
-
-        # Oblicz znaki dla trzech par punktów
-        d1 = sign(point, pt1, pt2)
-        d2 = sign(point, pt2, pt3)
-        d3 = sign(point, pt3, pt1)
+        # Oblicz znaki dla trzech par punktów (obliczenia wpisane bezpośrednio,
+        # bez tworzenia funkcji pomocniczej przy każdym wywołaniu)
+        d1 = (px - bx) * (ay - by) - (ax - bx) * (py - by)
+        d2 = (px - cx) * (by - cy) - (bx - cx) * (py - cy)
+        d3 = (px - ax) * (cy - ay) - (cx - ax) * (py - ay)
 
         # Sprawdź czy wszystkie znaki mają tę samą orientację
         has_neg = (d1 < 0) or (d2 < 0) or (d3 < 0)
@@ -544,27 +705,129 @@ class ColoringGame:
         # Punkt jest wewnątrz jeśli nie ma zarówno dodatnich jak i ujemnych znaków
         return not (has_neg and has_pos)
 
-    def fill_triangle(self, img, triangle, color):
+    def build_triangle_id_map(self):
+        """
+        Tworzy obraz int32 o rozmiarze okna, w którym każdy piksel trójkąta ma
+        wartość jego indeksu (piksele poza trójkątami mają wartość -1).
+        """
+        self.triangle_id_map = np.full((self.window_height, self.window_width), -1, dtype=np.int32)
+        # Rysuj od końca, aby na wspólnych krawędziach został trójkąt o mniejszym indeksie
+        for i in range(len(self.tri_xy) - 1, -1, -1):
+            cv2.fillPoly(self.triangle_id_map, [self.tri_xy[i].reshape(3, 1, 2)], i)
+
+    def find_triangle(self, x, y):
+        """
+        Znajduje indeks trójkąta zawierającego punkt na podstawie mapy indeksów.
+        Trafienie w mapie jest potwierdzane dokładnym testem point_in_triangle, bo
+        fillPoly przypisuje piksele leżące przy krawędziach sąsiednim trójkątom.
+
+        Args:
+            x, y: Współrzędne punktu
+
+        Returns:
+            int: Indeks trójkąta zawierającego punkt lub -1
+        """
+        if self.triangle_id_map is None:
+            return -1
+        if not (0 <= x < self.window_width and 0 <= y < self.window_height):
+            return -1
+        i = int(self.triangle_id_map[y, x])
+        if i >= 0 and self.point_in_triangle((x, y), self.tri_xy[i]):
+            return i
+
+        # Piksel przy krawędzi - sprawdź po kolei trójkąty, których prostokąt
+        # otaczający zawiera punkt
+        bbox = self.tri_bbox
+        candidates = np.flatnonzero((bbox[:, 0] <= x) & (bbox[:, 2] >= x) &
+                                    (bbox[:, 1] <= y) & (bbox[:, 3] >= y))
+        for j in candidates:
+            if self.point_in_triangle((x, y), self.tri_xy[j]):
+                return int(j)
+        return -1
+
+    def fill_triangle(self, img, tri_index, color):
         """
         Wypełnia trójkąt zadanym kolorem i rysuje jego krawędzie.
 
         Args:
             img (numpy.ndarray): Obraz na którym rysujemy
-            triangle (tuple): Trójkąt jako krotka trzech punktów
+            tri_index (int): Indeks trójkąta w tablicy tri_xy
             color (tuple): Kolor wypełnienia w formacie BGR
         """
-        # Konwertuj punkty trójkąta do formatu wymaganego przez OpenCV
-        pts = np.array([triangle[0], triangle[1], triangle[2]], np.int32)
-        pts = pts.reshape((-1, 1, 2))
+        # Widok (1, 3, 2) na wierzchołki trójkąta - bez kopiowania i konwersji typu
+        pts = self.tri_xy[tri_index].reshape(1, 3, 2)
 
         # Wypełnij trójkąt kolorem
-        cv2.fillPoly(img, [pts], color)
+        cv2.fillPoly(img, pts, color)
+
+        # Narysuj ponownie krawędzie trójkąta aby były widoczne (jednym wywołaniem);
+        # zwykła linia LINE_8 wystarcza dla krawędzi grubości 1 px na jednolitym wypełnieniu
+        cv2.polylines(img, pts, True, self.triangulator.triangle_color, 1)
+
+    def restore_triangle(self, img, tri_index):
+        """
+        Przywraca piksele trójkąta do stanu wynikającego z historii kolorowania:
+        kopiuje je z zapamiętanego obrazu z triangulacją i ponownie rysuje na nich
+        pozostałe w historii kolorowania (wraz z krawędziami sąsiednich trójkątów).
+
+        Args:
+            img (numpy.ndarray): Obraz na którym przywracamy trójkąt
+            tri_index (int): Indeks trójkąta w tablicy tri_xy
+        """
+        x_min, y_min, x_max, y_max = (int(v) for v in self.tri_bbox[tri_index])
+
+        # Kolorowania z historii, których prostokąty otaczające nachodzą na trójkąt
+        replay = []
+        if self._paint_history:
+            indices = np.fromiter((entry[0] for entry in self._paint_history), dtype=np.intp,
+                                  count=len(self._paint_history))
+            bbox = self.tri_bbox[indices]
+            overlap = ((bbox[:, 0] <= x_max) & (bbox[:, 2] >= x_min) &
+                       (bbox[:, 1] <= y_max) & (bbox[:, 3] >= y_min))
+            replay = [self._paint_history[k] for k in np.flatnonzero(overlap)]
+            # Obszar roboczy obejmuje całe rysowane trójkąty, aby OpenCV nie przycinało
+            # krawędzi (przycięta linia może przejść przez inne piksele)
+            r_min = bbox[overlap].min(axis=0, initial=np.iinfo(np.int32).max)
+            r_max = bbox[overlap].max(axis=0, initial=np.iinfo(np.int32).min)
+            x_min, y_min = min(x_min, int(r_min[0])), min(y_min, int(r_min[1]))
+            x_max, y_max = max(x_max, int(r_max[2])), max(y_max, int(r_max[3]))
+
+        region = img[y_min:y_max + 1, x_min:x_max + 1]
+        work = self._clean_display[y_min:y_max + 1, x_min:x_max + 1].copy()
+        offset = (x_min, y_min)
+
+        # Maska pikseli, które zmieniło rysowanie trójkąta (wypełnienie i krawędzie)
+        mask = np.zeros(region.shape[:2], dtype=np.uint8)
+        pts = (self.tri_xy[tri_index] - offset).astype(np.int32).reshape(1, 3, 2)
+        cv2.fillPoly(mask, pts, 255)
+        cv2.polylines(mask, pts, True, 255, 1)
+
+        # Odtwórz kolejno pozostałe kolorowania w obszarze roboczym
+        for j, _, color in replay:
+            pts = (self.tri_xy[j] - offset).astype(np.int32).reshape(1, 3, 2)
+            cv2.fillPoly(work, pts, color)
+            cv2.polylines(work, pts, True, self.triangulator.triangle_color, 1)
+
+        np.copyto(region, work, where=mask[:, :, None].astype(bool))
+
+    def undo_last_paint(self):
+        """
+        Cofa ostatnie kolorowanie trójkąta.
+
+        Returns:
+            bool: True jeśli było co cofnąć
+        """
+        if not self._paint_history:
+            return False
 
-        # Narysuj ponownie krawędzie trójkąta aby były widoczne
-        pt1, pt2, pt3 = triangle
-        cv2.line(img, pt1, pt2, self.triangulator.triangle_color, 1, cv2.LINE_AA)
-        cv2.line(img, pt2, pt3, self.triangulator.triangle_color, 1, cv2.LINE_AA)
-        cv2.line(img, pt3, pt1, self.triangulator.triangle_color, 1, cv2.LINE_AA)
+        i, previous_color, _ = self._paint_history.pop()
+        if previous_color is None:
+            del self.triangle_colors[i]
+        else:
+            self.triangle_colors[i] = previous_color
+        # Odtwórz trójkąt i jego otoczenie z czystego obrazu i pozostałej historii
+        self.restore_triangle(self.display_image, i)
+        return True
 
     def handle_click(self, event, x, y, flags, param):
         """
@@ -576,19 +839,22 @@ class ColoringGame:
             flags: Dodatkowe flagi zdarzenia
             param: Dodatkowe parametry (nieużywane)
         """
+        self._last_event = time.monotonic()
         if event == cv2.EVENT_LBUTTONDOWN:  # Kliknięcie lewym przyciskiem myszy
-            # Sprawdź wszystkie trójkąty aby znaleźć ten, w który kliknięto
-            for i, triangle in enumerate(self.triangles):
-                if self.point_in_triangle((x, y), triangle):
-                    # Zapamiętaj kolor trójkąta w słowniku
-                    self.triangle_colors[i] = self.current_color
+            # Znajdź pierwszy trójkąt, w który kliknięto
+            i = self.find_triangle(x, y)
+            if i >= 0:
+                # Zapamiętaj poprzedni i nowy kolor trójkąta, aby można było cofnąć zmianę
+                self._paint_history.append((i, self.triangle_colors.get(i), self.current_color))
 
-                    # Wypełnij trójkąt wybranym kolorem
-                    self.fill_triangle(self.display_image, triangle, self.current_color)
+                # Zapamiętaj kolor trójkąta w słowniku
+                self.triangle_colors[i] = self.current_color
 
-                    # Zaktualizuj wyświetlany obraz
-                    self.display_main_window()
-                    break  # Przerwij po znalezieniu pierwszego pasującego trójkąta
+                # Wypełnij trójkąt wybranym kolorem
+                self.fill_triangle(self.display_image, i, self.current_color)
+
+                # Zaktualizuj wyświetlany obraz
+                self.display_main_window()
 
     def run(self):
         """
@@ -616,33 +882,54 @@ class ColoringGame:
 
         # Główna pętla aplikacji
         density_window_visible = True  # Czy okno kontroli gęstości jest widoczne
+        next_close_check = 0.0  # Czas kolejnego sprawdzenia, czy główne okno jest otwarte
 
         while self.running:
-            # Czekaj na naciśnięcie klawisza (100ms timeout)
-            key = cv2.waitKey(100) & 0xFF  # Maska dla zgodności z różnymi systemami
+            # Czekaj na naciśnięcie klawisza - krótko przy aktywności użytkownika,
+            # dłużej gdy przez 2 sekundy nic się nie działo (mniej wybudzeń procesora)
+            timeout = 30 if time.monotonic() - self._last_event < 2.0 else 250
+            key = cv2.waitKey(timeout) & 0xFF  # Maska dla zgodności z różnymi systemami
+            now = time.monotonic()
+            if key != 0xFF:
+                self._last_event = now
+
+            # Przelicz siatkę, gdy suwaki gęstości przestały się przesuwać
+            # (suwak OpenCV nie zgłasza zwolnienia przycisku myszy)
+            if (self._density_changed_at is not None and
+                    now - self._density_changed_at >= self.density_debounce):
+                self._density_changed_at = None
+                self.process_image()
+                self.display_main_window()
 
-            # Sprawdź czy główne okno zostało zamknięte
-            if cv2.getWindowProperty(self.main_window, cv2.WND_PROP_VISIBLE) < 1:
-                self.running = False
+            # Sprawdź czy główne okno zostało zamknięte (raz na sekundę)
+            if now >= next_close_check:
+                if cv2.getWindowProperty(self.main_window, cv2.WND_PROP_VISIBLE) < 1:
+                    self.running = False
+                next_close_check = now + 1.0
 
             # Obsługa skrótów klawiszowych
             if key == 27:  # Klawisz ESC - zakończ aplikację
                 self.running = False
 
             elif key == ord('r') or key == ord('R'):  # Reset kolorowania
-                # Przywróć oryginalny obraz z triangulacją
-                self.display_image = self.original_image.copy()
-                self.triangulator.draw_delaunay_triangles(
-                    self.display_image, self.triangles, self.triangulator.triangle_color)
-                # Wyczyść słownik kolorów
+                # Przywróć zapamiętany obraz z triangulacją (bez ponownego rysowania krawędzi)
+                np.copyto(self.display_image, self._clean_display)
+                # Wyczyść słownik kolorów i historię
                 self.triangle_colors = {}
+                self._paint_history = []
                 self.display_main_window()
                 print("Kolorowanie zostało zresetowane")
 
+            elif key == ord('u') or key == ord('U'):  # Cofnij ostatnie kolorowanie
+                if self.undo_last_paint():
+                    self.display_main_window()
+                    print("Cofnięto ostatnie kolorowanie")
+
             elif key == ord('s') or key == ord('S'):  # Zapisz wynik
+                # Kopia obrazu zapisywana jest w tle - kolorowanie może trwać dalej
+                # (komunikat o zapisie wyświetla wątek zapisujący)
                 output_filename = "kolorowanka_wynik.jpg"
-                cv2.imwrite(output_filename, self.display_image)
-                print(f"Zapisano wynik do: {output_filename}")
+                save_result(self.display_image, output_filename, async_=True)
 
             elif key == ord('d') or key == ord('D'):  # Pokaż/ukryj okno gęstości
                 if density_window_visible:
@@ -665,9 +952,9 @@ class ColoringGame:
                 self.process_image()
                 self.display_main_window()
 
-                # Zaktualizuj okno kontroli jeśli jest widoczne
+                # Zaktualizuj suwaki jeśli okno kontroli jest widoczne
                 if density_window_visible:
-                    self.create_density_control_window()
+                    self.update_density_trackbars()
                 print("Zwiększono gęstość siatki")
 
             elif key == ord('-') or key == ord('_'):  # Zmniejsz gęstość siatki
@@ -681,9 +968,9 @@ class ColoringGame:
                 self.process_image()
                 self.display_main_window()
 
-                # Zaktualizuj okno kontroli jeśli jest widoczne
+                # Zaktualizuj suwaki jeśli okno kontroli jest widoczne
                 if density_window_visible:
-                    self.create_density_control_window()
+                    self.update_density_trackbars()
                 print("Zmniejszono gęstość siatki")
 
         # Zamknij wszystkie okna po zakończeniu aplikacji
@@ -16,40 +16,91 @@ Data: 2024
 
 import sys
 import os
-import cv2
+import re
+import logging
+import importlib.util
 
-# Importy z własnych modułów
-from triangulation import ImageTriangulation
-from coloring_game import ColoringGame
-from utils import (display_results, save_result, print_help,
-                   check_opencv_version, setup_matplotlib_polish,
-                   log_action)
+# Moduły aplikacji (a wraz z nimi OpenCV, SciPy i matplotlib) są importowane
+# dopiero w funkcjach, które ich używają - sprawdzenie zależności działa bez nich
 
+# Dziennik akcji aplikacji (komunikaty widoczne po uruchomieniu z opcją -v / --verbose)
+logger = logging.getLogger("kolorowanka")
 
-def main():
+# Rozszerzenia obsługiwanych plików obrazów (bez względu na wielkość liter)
+_IMG_RE = re.compile(r"\.(jpe?g|png|bmp|tiff)$", re.IGNORECASE)
+
+
+def _list_image_files(path):
     """
-    Główna funkcja aplikacji. Uruchamia tryb kolorowanki.
+    Zwraca nazwy plików obrazów w katalogu (jedno przejście os.scandir).
+
+    Args:
+        path (str): Ścieżka do katalogu
+
+    Returns:
+        list: Lista nazw plików obrazów
     """
-    # Konfiguracja kodowania dla polskich znaków
-    if sys.stdout.encoding != 'utf-8':
+    match = _IMG_RE.search  # Metoda wyszukiwana raz, nie dla każdego pliku
+    with os.scandir(path) as entries:
+        return [entry.name for entry in entries
+                if match(entry.name) and entry.is_file()]
+
+
+def _opencv_error():
+    """
+    Zwraca klasę wyjątku OpenCV, jeśli moduł cv2 został już zaimportowany.
+
+    Returns:
+        type: cv2.error lub OSError gdy cv2 nie jest jeszcze wczytany
+    """
+    cv2 = sys.modules.get("cv2")
+    return cv2.error if cv2 is not None else OSError
+
+
+_encoding_fixed = False  # Czy kodowanie wyjścia zostało już sprawdzone
+
+
+def _ensure_utf8():
+    """
+    Ustawia kodowanie UTF-8 dla standardowego wyjścia (tylko raz na proces).
+    """
+    global _encoding_fixed
+    if _encoding_fixed:
+        return
+
+    encoding = sys.stdout.encoding
+    if encoding and encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
         try:
             # Próba ustawienia kodowania UTF-8 dla terminala
             sys.stdout.reconfigure(encoding='utf-8')
-        except:
+        except Exception:
             # Jeśli nie udało się, kontynuuj z domyślnym kodowaniem
             pass
+    _encoding_fixed = True
 
-    # Sprawdź wersję OpenCV
-    check_opencv_version()
 
-    # Konfiguruj matplotlib dla polskich znaków
-    setup_matplotlib_polish()
+def setup_logging(verbose):
+    """
+    Konfiguruje dziennik akcji aplikacji.
+
+    Args:
+        verbose (bool): True aby wyświetlać komunikaty diagnostyczne
+    """
+    logging.basicConfig(format="[%(asctime)s] %(message)s", datefmt="%H:%M:%S")
+    logger.setLevel(logging.DEBUG if verbose else logging.WARNING)
+
+
+def main():
+    """
+    Główna funkcja aplikacji. Uruchamia tryb kolorowanki.
+    """
+    # Konfiguracja kodowania dla polskich znaków
+    _ensure_utf8()
 
-    print("=== KOLOROWANKA Z TRIANGULACJĄ DELAUNAYA ===")
-    print("Wersja: 2.0 (rozszerzona)")
-    print()
+    sys.stdout.write("=== KOLOROWANKA Z TRIANGULACJĄ DELAUNAYA ===\n"
+                     "Wersja: 2.0 (rozszerzona)\n\n")
 
-    log_action("Uruchomienie", "Tryb kolorowanki")
+    logger.debug("Uruchomienie - %s", "Tryb kolorowanki")
     run_coloring_game_mode()
 
 
@@ -58,15 +109,14 @@ def run_coloring_game_mode():
     Uruchamia aplikację w trybie interaktywnej gry kolorowanki.
     """
     try:
-        print("Uruchamianie interaktywnej kolorowanki...")
-        print("Naciśnij 'H' w aplikacji aby wyświetlić pomoc")
-        print()
+        sys.stdout.write("Uruchamianie interaktywnej kolorowanki...\n"
+                         "Naciśnij 'H' w aplikacji aby wyświetlić pomoc\n\n")
 
         # Sprawdź czy są dostępne pliki obrazów
-        import glob
-        image_files = (glob.glob("*.jpg") + glob.glob("*.jpeg") +
-                       glob.glob("*.png") + glob.glob("*.bmp") +
-                       glob.glob("*.tiff"))
+        # Lista jest przekazywana do gry razem z czasem modyfikacji katalogu,
+        # aby gra nie przeglądała katalogu ponownie, jeśli nic się nie zmieniło
+        dir_mtime = os.stat(".").st_mtime_ns
+        image_files = _list_image_files(".")
 
         if not image_files:
             print("⚠ Uwaga: Nie znaleziono plików obrazów w bieżącym katalogu")
@@ -77,27 +127,52 @@ def run_coloring_game_mode():
 
         print(f"✓ Znaleziono {len(image_files)} plików obrazów")
 
+        # Konfiguracja bibliotek dopiero gdy wiadomo, że gra zostanie uruchomiona
+        from utils import check_opencv_version, setup_matplotlib_polish
+
+        # Sprawdź wersję OpenCV
+        check_opencv_version()
+
+        # Konfiguruj matplotlib dla polskich znaków
+        setup_matplotlib_polish()
+
         # Utwórz i uruchom grę kolorowanki
-        game = ColoringGame()
-        log_action("Gra", "Inicjalizacja kolorowanki")
+        from coloring_game import ColoringGame
+        game = ColoringGame(image_files=image_files, dir_mtime=dir_mtime)
+        logger.debug("Gra - %s", "Inicjalizacja kolorowanki")
 
         # Uruchom główną pętlę gry
         game.run()
 
-        log_action("Gra", "Kolorowanka została zamknięta")
+        logger.debug("Gra - %s", "Kolorowanka została zamknięta")
         print("Dziękujemy za korzystanie z kolorowanki!")
 
     except KeyboardInterrupt:
         print("\n⚠ Przerwano przez użytkownika")
-        log_action("Gra", "Przerwano przez użytkownika")
-    except Exception as e:
-        log_action("Błąd", f"Błąd w trybie gry: {str(e)}")
+        logger.debug("Gra - %s", "Przerwano przez użytkownika")
+        # Dokończ zapisy obrazów zlecone w tle, aby nie zostawić uciętego pliku
+        utils = sys.modules.get("utils")
+        if utils is not None:
+            utils.wait_for_saves()
+        # Zakończ od razu kodem 130 (konwencja POSIX dla SIGINT), bez sprzątania
+        # tablic NumPy/OpenCV i zamykania matplotlib przez interpreter
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os._exit(130)
+    except ImportError as e:
+        logger.debug("Błąd - Brak biblioteki: %s", e)
         print(f"✗ Wystąpił błąd w trybie kolorowanki: {e}")
         print("Sprawdź czy wszystkie wymagane biblioteki są zainstalowane:")
         print("- opencv-python")
         print("- numpy")
         print("- scipy")
         print("- matplotlib")
+    except (_opencv_error(), OSError, ValueError) as e:
+        # Błędy odczytu plików i przetwarzania obrazu; inne wyjątki to błędy
+        # programu i są zgłaszane dalej z pełnym komunikatem
+        logger.debug("Błąd - Błąd w trybie gry: %s", e)
+        print(f"✗ Wystąpił błąd w trybie kolorowanki: {e}")
+        sys.exit(1)
 
 
 def check_dependencies():
@@ -114,20 +189,24 @@ def check_dependencies():
         'matplotlib': 'matplotlib'
     }
 
+    available_modules = []
     missing_modules = []
 
+    # find_spec tylko odnajduje moduł na dysku, bez jego importowania
     for module, package in required_modules.items():
-        try:
-            __import__(module)
-            print(f"✓ {package}")
-        except ImportError:
-            print(f"✗ {package} - BRAK")
+        if importlib.util.find_spec(module) is None:
             missing_modules.append(package)
+        else:
+            available_modules.append(package)
+
+    # Jeden komunikat podsumowujący zamiast osobnej linii dla każdego pakietu
+    if available_modules:
+        print(f"✓ {', '.join(available_modules)}")
 
     if missing_modules:
-        print(f"\nBrakujące pakiety: {', '.join(missing_modules)}")
-        print("Zainstaluj je używając:")
-        print(f"pip install {' '.join(missing_modules)}")
+        print(f"✗ BRAK: {', '.join(missing_modules)}\n"
+              "Zainstaluj je używając:\n"
+              f"pip install {' '.join(missing_modules)}")
         return False
 
     return True
@@ -137,15 +216,30 @@ if __name__ == "__main__":
     """
     Punkt wejścia aplikacji. Sprawdza zależności i uruchamia główną funkcję.
     """
-    print("Sprawdzanie zależności...")
-
-    # Sprawdź czy wszystkie wymagane moduły są dostępne
-    if not check_dependencies():
-        print("\n✗ Niektóre wymagane biblioteki nie są zainstalowane")
-        print("Zainstaluj brakujące pakiety i uruchom aplikację ponownie")
-        sys.exit(1)
-
-    print("✓ Wszystkie zależności są dostępne\n")
+    _ensure_utf8()
+    setup_logging("-v" in sys.argv[1:] or "--verbose" in sys.argv[1:])
+
+    # Zależności sprawdzamy tylko przy pierwszym udanym uruchomieniu (plik znacznika
+    # w ~/.cache) - można je też pominąć zmienną środowiskową KOLOROWANKA_SKIP_DEPCHECK
+    if not os.environ.get("KOLOROWANKA_SKIP_DEPCHECK"):
+        stamp = os.path.expanduser("~/.cache/kolorowanka_deps_ok")
+        if not os.path.exists(stamp):
+            print("Sprawdzanie zależności...")
+
+            # Sprawdź czy wszystkie wymagane moduły są dostępne
+            if not check_dependencies():
+                print("\n✗ Niektóre wymagane biblioteki nie są zainstalowane")
+                print("Zainstaluj brakujące pakiety i uruchom aplikację ponownie")
+                sys.exit(1)
+
+            print("✓ Wszystkie zależności są dostępne\n")
+
+            # Zapamiętaj wynik sprawdzenia (brak możliwości zapisu nie jest błędem)
+            try:
+                os.makedirs(os.path.dirname(stamp), exist_ok=True)
+                open(stamp, "w").close()
+            except OSError:
+                pass
 
     # Uruchom główną funkcję
     main()
@@ -0,0 +1,64 @@
+"""
+Testy cofania kolorowania trójkątów w klasie ColoringGame.
+"""
+
+import unittest
+
+import cv2
+import numpy as np
+
+from coloring_game import ColoringGame
+
+
+class UndoPaintTest(unittest.TestCase):
+    """
+    Sprawdza, że cofnięcie kolorowania przywraca obraz sprzed ostatniego kliknięcia.
+    """
+
+    def setUp(self):
+        # Dwa trójkąty ze wspólną krawędzią (300, 120) - (180, 320)
+        self.game = ColoringGame()
+        self.game.tri_xy = np.array([[(100, 100), (300, 120), (180, 320)],
+                                     [(300, 120), (180, 320), (380, 330)]], dtype=np.int32)
+        self.game.tri_bbox = np.concatenate([self.game.tri_xy.min(axis=1),
+                                             self.game.tri_xy.max(axis=1)], axis=1)
+        self.game.build_triangle_id_map()
+
+        # Obraz z triangulacją rysowaną wygładzonymi liniami, jak w ImageTriangulation
+        clean = np.full((self.game.window_height, self.game.window_width, 3), 200, dtype=np.uint8)
+        cv2.polylines(clean, list(self.game.tri_xy.reshape(-1, 3, 1, 2)), True,
+                      self.game.triangulator.triangle_color, 1, cv2.LINE_AA)
+        self.game._clean_display = clean
+        self.game.display_image = clean.copy()
+        self.game.display_main_window = lambda: None
+
+    def paint(self, x, y, color_index):
+        self.game.current_color = self.game._color(color_index)
+        self.game.handle_click(cv2.EVENT_LBUTTONDOWN, x, y, 0, None)
+
+    def test_undo_neighbour_keeps_painted_edge(self):
+        self.paint(190, 180, 0)
+        painted_a = self.game.display_image.copy()
+        self.paint(290, 260, 1)
+
+        self.assertTrue(self.game.undo_last_paint())
+        np.testing.assert_array_equal(self.game.display_image, painted_a)
+        self.assertEqual(self.game.triangle_colors, {0: self.game._color(0)})
+
+    def test_undo_recolor_restores_previous_state(self):
+        self.paint(190, 180, 0)
+        self.paint(290, 260, 1)
+        painted_ab = self.game.display_image.copy()
+        self.paint(190, 180, 2)
+
+        self.assertTrue(self.game.undo_last_paint())
+        np.testing.assert_array_equal(self.game.display_image, painted_ab)
+
+        self.assertTrue(self.game.undo_last_paint())
+        self.assertTrue(self.game.undo_last_paint())
+        np.testing.assert_array_equal(self.game.display_image, self.game._clean_display)
+        self.assertFalse(self.game.undo_last_paint())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,120 @@
 Moduł zawierający klasę ImageTriangulation do tworzenia triangulacji Delaunaya na obrazach.
 """
 
+import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import cv2
 from scipy.spatial import Delaunay
 
+# Włącz zoptymalizowane (SIMD) ścieżki funkcji OpenCV, np. Canny i rozmycia,
+# jeśli zostały wyłączone
+if not cv2.useOptimized():
+    cv2.setUseOptimized(True)
+
+try:
+    # Numba jest opcjonalna - bez niej używamy wersji NumPy
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+
+def _point_in_edges(px, py, edges):
+    """
+    Test ray casting dla jednego punktu i wielokąta zapisanego jako tablica.
+
+    Warunek przecięcia krawędzi odpowiada ImageTriangulation.point_in_polygon
+    (dolny koniec krawędzi wyłączony, górny włączony, punkt na krawędzi wewnątrz).
+
+    Args:
+        px, py: Współrzędne punktu
+        edges (numpy.ndarray): Krawędzie wielokąta (x0, y0, dx, dy) jako tablica (n, 4) float64
+
+    Returns:
+        bool: True jeśli punkt jest wewnątrz wielokąta
+    """
+    inside = False
+    for i in range(edges.shape[0]):
+        y0 = edges[i, 1]
+        dy = edges[i, 3]
+        # Krawędź przecina poziomą prostą przez punkt (poziome krawędzie nigdy)
+        if (y0 < py) != (y0 + dy < py):
+            # Punkt na lewo od przecięcia (lub na nim) - porównanie bez dzielenia
+            side = (px - edges[i, 0]) * dy - (py - y0) * edges[i, 2]
+            if (side <= 0) if dy > 0 else (side >= 0):
+                inside = not inside
+    return inside
+
+
+def _points_in_polygon(points, edges):
+    """
+    Test ray casting dla wielu punktów i wielokąta zapisanego jako tablica.
+
+    Args:
+        points (numpy.ndarray): Punkty do sprawdzenia jako tablica (m, 2) float64
+        edges (numpy.ndarray): Krawędzie wielokąta (x0, y0, dx, dy) jako tablica (n, 4) float64
+
+    Returns:
+        numpy.ndarray: Tablica bool (m,) - True dla punktów wewnątrz wielokąta
+    """
+    result = np.empty(points.shape[0], dtype=np.bool_)
+
+    # Punkty są niezależne - z Numbą sprawdzane są równolegle
+    for k in prange(points.shape[0]):
+        result[k] = _point_in_edges(points[k, 0], points[k, 1], edges)
+    return result
+
+
+def _filter_triangles(vertices, edges, width, height):
+    """
+    Wybiera trójkąty leżące w granicach obrazu, których środek jest wewnątrz wielokąta.
+
+    Łączy w jednej pętli test granic obrazu, wyznaczenie środka i ray casting,
+    bez tablic pośrednich (maska granic, środki trójkątów).
+
+    Args:
+        vertices (numpy.ndarray): Wierzchołki trójkątów jako tablica (k, 3, 2) int32
+        edges (numpy.ndarray): Krawędzie wielokąta (x0, y0, dx, dy) jako tablica (n, 4) float64
+        width (int): Szerokość obrazu (granica włącznie)
+        height (int): Wysokość obrazu (granica włącznie)
+
+    Returns:
+        numpy.ndarray: Tablica bool (k,) - True dla trójkątów do zachowania
+    """
+    keep = np.zeros(vertices.shape[0], dtype=np.bool_)
+
+    for k in prange(vertices.shape[0]):
+        in_image = True
+        sum_x = 0
+        sum_y = 0
+        for j in range(3):
+            x = vertices[k, j, 0]
+            y = vertices[k, j, 1]
+            if x < 0 or x > width or y < 0 or y > height:
+                in_image = False
+            sum_x += x
+            sum_y += y
+
+        if in_image:
+            keep[k] = _point_in_edges(sum_x // 3, sum_y // 3, edges)
+    return keep
+
+
+if njit is not None:
+    # Skompilowane wersje testów (pętle wywołują skompilowany _point_in_edges)
+    _point_in_edges = njit(cache=True)(_point_in_edges)
+    points_in_polygon_compiled = njit(parallel=True, cache=True)(_points_in_polygon)
+    filter_triangles_compiled = njit(parallel=True, cache=True)(_filter_triangles)
+else:
+    filter_triangles_compiled = None
+    try:
+        # Bez Numby - rozszerzenie Cython skompilowane z _pip.pyx (opcjonalne)
+        from _pip import points_in_polygon as points_in_polygon_compiled
+    except ImportError:
+        points_in_polygon_compiled = None
+
 
 class ImageTriangulation:
     """
@@ -21,6 +131,7 @@ class ImageTriangulation:
         self.n_contour_points = 30  # Liczba punktów rozmieszczonych na konturze
         self.interior_density = 8  # Gęstość punktów wewnętrznych (im większa, tym więcej punktów)
         self.min_contour_area = 1000  # Minimalny obszar konturu do przetworzenia
+        self.contour_downsample_limit = 1000  # Obrazy o dłuższym boku powyżej tej wartości są zmniejszane przed detekcją konturów
 
         # Kolory używane do rysowania elementów triangulacji
         self.triangle_color = (0, 0, 0)  # Czarne linie triangulacji (format BGR)
@@ -59,22 +170,36 @@ class ImageTriangulation:
         # Konwertuj współrzędne na liczby całkowite i narysuj kółko
         cv2.circle(img, tuple(map(int, point)), radius, color, -1, cv2.LINE_AA)
 
+    def draw_points(self, img, points, color, radius=2):
+        """
+        Rysuje wiele punktów na obrazie jako wypełnione kółka.
+
+        Args:
+            img (numpy.ndarray): Obraz na którym rysujemy
+            points (numpy.ndarray): Współrzędne punktów jako tablica (n, 2)
+            color (tuple): Kolor w formacie BGR
+            radius (int): Promień kółek
+        """
+        # Jedna konwersja całej tablicy do liczb Pythona zamiast osobnej dla każdego punktu
+        circle = cv2.circle
+        for x, y in np.asarray(points, dtype=np.int32).reshape(-1, 2).tolist():
+            circle(img, (x, y), radius, color, -1, cv2.LINE_AA)
+
     def draw_delaunay_triangles(self, img, triangles, color):
         """
         Rysuje krawędzie trójkątów triangulacji Delaunaya na obrazie.
 
         Args:
             img (numpy.ndarray): Obraz na którym rysujemy
-            triangles (list): Lista trójkątów, każdy jako tuple trzech punktów
+            triangles (numpy.ndarray): Wierzchołki trójkątów jako tablica (n, 3, 2) lub lista trójkątów
             color (tuple): Kolor linii w formacie BGR
         """
-        # Iteruj przez wszystkie trójkąty
-        for triangle in triangles:
-            pt1, pt2, pt3 = triangle  # Rozpakuj współrzędne wierzchołków
-            # Narysuj każdą krawędź trójkąta z wygładzaniem
-            cv2.line(img, pt1, pt2, color, 1, cv2.LINE_AA)
-            cv2.line(img, pt2, pt3, color, 1, cv2.LINE_AA)
-            cv2.line(img, pt3, pt1, color, 1, cv2.LINE_AA)
+        if len(triangles) == 0:
+            return
+
+        # Narysuj zamknięte krawędzie wszystkich trójkątów z wygładzaniem jednym wywołaniem
+        pts = np.asarray(triangles, dtype=np.int32).reshape(-1, 3, 1, 2)
+        cv2.polylines(img, list(pts), True, color, 1, cv2.LINE_AA)
 
     def point_in_polygon(self, point, polygon_points):
         """
@@ -114,6 +239,58 @@ class ImageTriangulation:
 
         return inside
 
+    def points_in_polygon(self, points, polygon_points):
+        """
+        Sprawdza jednocześnie wiele punktów algorytmem ray casting.
+
+        Gdy dostępna jest Numba, punkty są sprawdzane równolegle skompilowaną pętlą
+        (bez Numby - pętlą z rozszerzenia Cython _pip, jeśli jest skompilowane),
+        w przeciwnym razie obliczenia wykonuje NumPy. Warunki przecięcia krawędzi
+        są takie same jak w point_in_polygon.
+
+        Args:
+            points (numpy.ndarray): Punkty do sprawdzenia jako tablica (m, 2)
+            polygon_points (list): Lista punktów definiujących wielokąt
+
+        Returns:
+            numpy.ndarray: Tablica bool (m,) - True dla punktów wewnątrz wielokąta
+        """
+        edges = self.polygon_edges(polygon_points)
+        points = np.ascontiguousarray(points, dtype=np.float64).reshape(-1, 2)
+
+        # Skompilowana pętla po punktach (bez macierzy punkty x krawędzie)
+        if points_in_polygon_compiled is not None:
+            return points_in_polygon_compiled(points, edges)
+
+        x0, y0, dx, dy = edges.T
+        x, y = points[:, :1], points[:, 1:]  # Kolumny (m, 1) do rozgłaszania po krawędziach
+
+        # Macierz (punkty x krawędzie): czy promień z punktu przecina krawędź
+        crosses_y = (y0 < y) != (y0 + dy < y)
+        # Punkt na lewo od przecięcia (lub na nim): zamiast liczyć współrzędną
+        # przecięcia, porównaj iloczyny (znak zależy od kierunku krawędzi)
+        side = (x - x0) * dy - (y - y0) * dx
+        crossings = crosses_y & np.where(dy > 0, side <= 0, side >= 0)
+
+        return np.logical_xor.reduce(crossings, axis=1)
+
+    def polygon_edges(self, polygon_points):
+        """
+        Wyznacza krawędzie wielokąta w postaci używanej przez points_in_polygon.
+
+        Args:
+            polygon_points (list): Lista punktów definiujących wielokąt
+
+        Returns:
+            numpy.ndarray: Tablica (n, 4) float64 - początek krawędzi (x0, y0)
+            i przyrosty (dx, dy) do jej końca; ostatnia krawędź zamyka wielokąt
+        """
+        polygon = np.asarray(polygon_points, dtype=np.float64).reshape(-1, 2)
+        edges = np.empty((len(polygon), 4), dtype=np.float64)
+        edges[:, :2] = polygon
+        edges[:, 2:] = np.roll(polygon, -1, axis=0) - polygon
+        return edges
+
     def get_contours_from_image(self, image):
         """
         Znajduje kontury w obrazie używając detekcji krawędzi Canny.
@@ -124,11 +301,19 @@ class ImageTriangulation:
         Returns:
             list: Lista konturów spełniających kryteria powierzchni
         """
-        # Konwersja do skali szarości jeśli obraz jest kolorowy
+        # Konwersja do skali szarości (uint8) jeśli obraz jest kolorowy; obraz
+        # w skali szarości nie jest kopiowany - kolejne kroki go nie modyfikują
         if len(image.shape) == 3:
             gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         else:
-            gray = image.copy()
+            gray = image
+
+        # Duże obrazy zmniejsz dwukrotnie przed detekcją krawędzi (4x mniej pikseli
+        # dla rozmycia, Canny i wyszukiwania konturów)
+        scale = 1
+        if max(gray.shape[:2]) > self.contour_downsample_limit:
+            gray = cv2.pyrDown(gray)
+            scale = 2
 
         # Rozmycie gaussowskie w celu redukcji szumu
         blurred = cv2.GaussianBlur(gray, (5, 5), 0)
@@ -139,14 +324,14 @@ class ImageTriangulation:
         # Znajdź kontury na obrazie krawędzi
         contours, _ = cv2.findContours(edges, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
 
-        # Filtruj kontury według minimalnej powierzchni
-        filtered_contours = []
-        for contour in contours:
-            area = cv2.contourArea(contour)  # Oblicz powierzchnię konturu
-            if area > self.min_contour_area:  # Zachowaj tylko duże kontury
-                filtered_contours.append(contour)
+        # Przeskaluj kontury z powrotem do rozdzielczości oryginalnego obrazu
+        if scale != 1:
+            contours = [contour * scale for contour in contours]
 
-        return filtered_contours
+        # Filtruj kontury według minimalnej powierzchni (zachowaj tylko duże kontury)
+        contour_area = cv2.contourArea
+        min_area = self.min_contour_area
+        return [contour for contour in contours if contour_area(contour) > min_area]
 
     def place_points_on_contour(self, contour, n_points):
         """
@@ -157,7 +342,7 @@ class ImageTriangulation:
             n_points (int): Liczba punktów do rozmieszczenia
 
         Returns:
-            list: Lista punktów równomiernie rozmieszczonych na konturze
+            numpy.ndarray: Punkty równomiernie rozmieszczone na konturze jako tablica (n, 2) int32
         """
         # Przekształć kontur do tablicy punktów 2D
         contour = contour.reshape(-1, 2).astype(np.float32)
@@ -171,50 +356,47 @@ class ImageTriangulation:
 
         # Jeśli kontur ma zerową długość, zwróć pierwsze n punktów
         if total_length == 0:
-            return [(int(p[0]), int(p[1])) for p in contour[:n_points]]
+            return contour[:n_points].astype(np.int32)
 
-        # Oblicz odstęp między punktami
+        # Oblicz odstęp między punktami i docelowe odległości od początku
+        # dla wszystkich pozostałych punktów naraz
         spacing = total_length / n_points
-        points = [contour[0]]  # Dodaj pierwszy punkt
-
-        # Rozmieść pozostałe punkty równomiernie
-        for i in range(1, n_points):
-            target_distance = i * spacing  # Docelowa odległość od początku
-
-            # Znajdź segment, w którym znajduje się punkt docelowy
-            idx = np.searchsorted(cumulative, target_distance)
+        target_distances = np.arange(1, n_points, dtype=np.float32) * spacing
 
-            # Zabezpieczenie przed przekroczeniem granic tablicy
-            if idx >= len(distances):
-                idx = len(distances) - 1
-            if idx == 0:
-                idx = 1
+        # Znajdź segmenty, w których znajdują się punkty docelowe
+        # (z zabezpieczeniem przed przekroczeniem granic tablicy)
+        idx = np.searchsorted(cumulative, target_distances)
+        idx = np.clip(idx, 1, len(distances) - 1)
 
-            # Interpoluj pozycję punktu wewnątrz segmentu
-            ratio = (target_distance - cumulative[idx - 1]) / distances[idx] if distances[idx] != 0 else 0
-            point = contour[idx - 1] + ratio * (contour[idx] - contour[idx - 1])
-            points.append(point)
+        # Interpoluj pozycje punktów wewnątrz segmentów
+        seg_lengths = distances[idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(seg_lengths != 0,
+                             (target_distances - cumulative[idx - 1]) / seg_lengths, 0)
+        ratio = ratio.astype(np.float32)[:, None]
+        points = np.vstack([contour[:1],
+                            contour[idx - 1] + ratio * (contour[idx] - contour[idx - 1])])
 
-        # Konwertuj do liczb całkowitych i zwróć jako listę krotek
-        return [(int(p[0]), int(p[1])) for p in points]
+        # Konwertuj do liczb całkowitych
+        return points.astype(np.int32)
 
     def generate_interior_points(self, contour_points, img_shape):
         """
         Generuje punkty wewnątrz obszaru ograniczonego konturem.
 
         Args:
-            contour_points (list): Lista punktów konturu
+            contour_points (numpy.ndarray): Punkty konturu jako tablica (n, 2)
             img_shape (tuple): Kształt obrazu (wysokość, szerokość)
 
         Returns:
-            list: Lista punktów wewnętrznych
+            numpy.ndarray: Punkty wewnętrzne jako tablica (m, 2) int32
         """
         # Sprawdź czy kontur ma wystarczającą liczbę punktów
         if len(contour_points) < 3:
-            return []
+            return np.empty((0, 2), dtype=np.int32)
 
         # Znajdź prostokąt obejmujący kontur
-        contour_array = np.array(contour_points)
+        contour_array = np.asarray(contour_points, dtype=np.int32).reshape(-1, 2)
         min_x, min_y = np.min(contour_array, axis=0)
         max_x, max_y = np.max(contour_array, axis=0)
 
@@ -226,79 +408,128 @@ class ImageTriangulation:
         step_x = max(width // self.interior_density, 5)
         step_y = max(height // self.interior_density, 5)
 
-        interior_points = []
+        # Generuj punkty w regularnej siatce (wiersz po wierszu)
+        xs = np.arange(int(min_x + step_x), int(max_x), int(step_x))
+        ys = np.arange(int(min_y + step_y), int(max_y), int(step_y))
+        grid_x, grid_y = np.meshgrid(xs, ys)
+        candidates = np.stack([grid_x.ravel(), grid_y.ravel()], axis=1)
 
-        # Generuj punkty w regularnej siatce
-        for y in range(int(min_y + step_y), int(max_y), int(step_y)):
-            for x in range(int(min_x + step_x), int(max_x), int(step_x)):
-                # Sprawdź czy punkt jest w granicach obrazu i wewnątrz konturu
-                if (0 <= x < img_shape[1] and 0 <= y < img_shape[0] and
-                        self.point_in_polygon((x, y), contour_points)):
-                    interior_points.append((x, y))
+        # Zachowaj punkty w granicach obrazu
+        in_image = ((candidates[:, 0] >= 0) & (candidates[:, 0] < img_shape[1]) &
+                    (candidates[:, 1] >= 0) & (candidates[:, 1] < img_shape[0]))
 
-        # Dodaj punkt centralny konturu
+        # Punkt centralny konturu jest dołączany jako ostatni kandydat, aby
+        # sprawdzić go tym samym wywołaniem co punkty siatki
         center_x = int((min_x + max_x) / 2)
         center_y = int((min_y + max_y) / 2)
-        if self.point_in_polygon((center_x, center_y), contour_points):
-            interior_points.append((center_x, center_y))
+        candidates = np.vstack([candidates[in_image], [(center_x, center_y)]])
 
-        return interior_points
+        # Zachowaj punkty wewnątrz konturu
+        interior_points = candidates[self.points_in_polygon(candidates, contour_array)]
+
+        return interior_points.astype(np.int32)
 
     def create_triangulation(self, contour_points, interior_points, img_shape):
         """
         Tworzy triangulację Delaunaya z punktów konturu i wewnętrznych.
 
         Args:
-            contour_points (list): Punkty na konturze
-            interior_points (list): Punkty wewnętrzne
+            contour_points (numpy.ndarray): Punkty na konturze jako tablica (n, 2)
+            interior_points (numpy.ndarray): Punkty wewnętrzne jako tablica (m, 2)
             img_shape (tuple): Kształt obrazu
 
         Returns:
-            list: Lista trójkątów jako krotek trzech punktów
+            numpy.ndarray: Wierzchołki trójkątów jako tablica (k, 3, 2) int32
         """
+        no_triangles = np.empty((0, 3, 2), dtype=np.int32)
+
         # Sprawdź czy mamy wystarczającą liczbę punktów
         if len(contour_points) < 3:
-            return []
-
-        # Połącz wszystkie punkty
-        all_points = contour_points + interior_points
-
-        if len(all_points) < 3:
-            return []
+            return no_triangles
 
         try:
-            # Konwertuj punkty do tablicy numpy
-            points_array = np.array(all_points, dtype=np.float32)
+            # Połącz wszystkie punkty w jedną tablicę
+            points = np.ascontiguousarray(np.concatenate([np.reshape(contour_points, (-1, 2)),
+                                                          np.reshape(interior_points, (-1, 2))]),
+                                          dtype=np.int32)
+
+            # Usuń powtarzające się punkty (np. punkt konturu pokrywający się z punktem
+            # siatki) - para współrzędnych int32 jest porównywana jako jedna liczba int64,
+            # a pozostałe punkty zachowują kolejność pierwszego wystąpienia
+            _, first = np.unique(points.view(np.int64).ravel(), return_index=True)
+            points_array = points[np.sort(first)].astype(np.float32)
 
             # Utwórz triangulację Delaunaya
             tri = Delaunay(points_array)
 
-            triangles = []
+            # Współrzędne wierzchołków wszystkich trójkątów jako tablica (n, 3, 2)
+            vertices = points_array[tri.simplices].astype(np.int32)
 
-            # Przetwórz każdy simplex (trójkąt) z triangulacji
-            for simplex in tri.simplices:
-                # Pobierz współrzędne wierzchołków trójkąta
-                pt1 = tuple(map(int, points_array[simplex[0]]))
-                pt2 = tuple(map(int, points_array[simplex[1]]))
-                pt3 = tuple(map(int, points_array[simplex[2]]))
+            # Z Numbą test granic i środków trójkątów wykonuje jedna skompilowana pętla
+            if filter_triangles_compiled is not None:
+                edges = self.polygon_edges(contour_points)
+                keep = filter_triangles_compiled(vertices, edges, img_shape[1], img_shape[0])
+                return vertices[keep]
 
-                # Sprawdź czy trójkąt jest w granicach obrazu
-                rect = (0, 0, img_shape[1], img_shape[0])
-                if (self.rect_contains(rect, pt1) and
-                        self.rect_contains(rect, pt2) and
-                        self.rect_contains(rect, pt3)):
+            # Zachowaj trójkąty, których wszystkie wierzchołki są w granicach obrazu
+            in_image = ((vertices[:, :, 0] >= 0) & (vertices[:, :, 0] <= img_shape[1]) &
+                        (vertices[:, :, 1] >= 0) & (vertices[:, :, 1] <= img_shape[0])).all(axis=1)
+            vertices = vertices[in_image]
 
-                    # Sprawdź czy środek trójkąta jest wewnątrz konturu
-                    center = ((pt1[0] + pt2[0] + pt3[0]) // 3,
-                              (pt1[1] + pt2[1] + pt3[1]) // 3)
-                    if self.point_in_polygon(center, contour_points):
-                        triangles.append((pt1, pt2, pt3))
-
-            return triangles
+            # Zachowaj trójkąty, których środek jest wewnątrz konturu (test wszystkich środków naraz)
+            centers = vertices.sum(axis=1) // 3
+            return vertices[self.points_in_polygon(centers, contour_points)]
 
         except Exception as e:
             print(f"Błąd triangulacji: {e}")
-            return []
+            return no_triangles
+
+    def triangulate_contour(self, contour_points, img_shape):
+        """
+        Generuje punkty wewnętrzne i tworzy triangulację jednego konturu.
+
+        Args:
+            contour_points (numpy.ndarray): Punkty konturu jako tablica (n, 2)
+            img_shape (tuple): Kształt obrazu
+
+        Returns:
+            tuple: Punkty wewnętrzne (m, 2) i wierzchołki trójkątów (k, 3, 2)
+            lub None dla konturu z niewystarczającą liczbą punktów
+        """
+        # Pomiń kontury z niewystarczającą liczbą punktów
+        if len(contour_points) < 3:
+            return None
+
+        # Generuj punkty wewnętrzne
+        interior_points = self.generate_interior_points(contour_points, img_shape)
+
+        # Utwórz triangulację
+        triangles = self.create_triangulation(contour_points, interior_points, img_shape)
+        return interior_points, triangles
+
+    def triangulate_contours(self, contours_points, img_shape):
+        """
+        Tworzy triangulację wielu konturów, przetwarzając je równolegle w puli wątków
+        (Qhull i NumPy zwalniają GIL podczas obliczeń).
+
+        Z Numbą kontury przetwarzane są po kolei w bieżącym wątku - skompilowane
+        pętle są już równoległe, a uruchamianie ich z wątków puli (warstwa wątków
+        workqueue) powoduje zawieszenie interpretera przy zakończeniu programu.
+
+        Args:
+            contours_points (list): Punkty kolejnych konturów jako tablice (n, 2)
+            img_shape (tuple): Kształt obrazu
+
+        Returns:
+            list: Wyniki triangulate_contour dla kolejnych konturów (w tej samej kolejności)
+        """
+        if njit is not None or len(contours_points) < 2:
+            return [self.triangulate_contour(points, img_shape) for points in contours_points]
+
+        workers = min(len(contours_points), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda points: self.triangulate_contour(points, img_shape),
+                                 contours_points))
 
     def process_image(self, image):
         """
@@ -316,31 +547,22 @@ class ImageTriangulation:
         # Utwórz kopię obrazu do rysowania wyników
         image_result = image.copy()
 
-        # Przetwórz każdy znaleziony kontur
-        for contour in contours:
-            # Rozmieść punkty na konturze
-            contour_points = self.place_points_on_contour(contour, self.n_contour_points)
+        # Rozmieść punkty na każdym konturze i utwórz triangulacje konturów
+        contours_points = [self.place_points_on_contour(contour, self.n_contour_points)
+                           for contour in contours]
+        results = self.triangulate_contours(contours_points, image.shape)
 
-            # Pomiń kontury z niewystarczającą liczbą punktów
-            if len(contour_points) < 3:
+        # Rysowanie na wspólnym obrazie wykonywane jest po kolei
+        for result in results:
+            if result is None:
                 continue
-
-            # Generuj punkty wewnętrzne
-            interior_points = self.generate_interior_points(contour_points, image.shape)
-
-            # Utwórz triangulację
-            triangles = self.create_triangulation(contour_points, interior_points, image.shape)
+            interior_points, triangles = result
 
             # Rysuj triangulację na obrazie
             self.draw_delaunay_triangles(image_result, triangles, self.triangle_color)
 
-            # Rysuj punkty wewnętrzne (dwa razy - prawdopodobnie błąd w oryginalnym kodzie)
-            for point in interior_points:
-                self.draw_point(image_result, point, self.interior_color, 2)
-
-            # To jest duplikacja powyższej pętli - prawdopodobnie błąd
-            for point in interior_points:
-                self.draw_point(image_result, point, self.interior_color, 2)
+            # Rysuj punkty wewnętrzne
+            self.draw_points(image_result, interior_points, self.interior_color, 2)
 
         return image_result
 
@@ -354,8 +576,6 @@ class ImageTriangulation:
         Returns:
             tuple: (oryginalny_obraz, przetworzony_obraz) lub (None, None) w przypadku błędu
         """
-        import os
-
         # Sprawdź czy plik istnieje
         if not os.path.exists(image_path):
             print(f"Plik {image_path} nie istnieje!")
@@ -2,62 +2,260 @@
 Moduł zawierający funkcje pomocnicze dla aplikacji kolorowanki.
 """
 
-import matplotlib.pyplot as plt
+import functools
+import logging
+import operator
+import os
+import re
+import stat
+import sys
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
 import cv2
+import numpy as np
+
+# matplotlib.pyplot jest importowany dopiero w display_results - bez okna
+# wyników nie są wczytywane biblioteki interfejsu graficznego
+
+# Dziennik akcji aplikacji (ten sam co w main.py)
+_logger = logging.getLogger("kolorowanka")
+
+# Jeden wątek zapisujący obrazy w tle (save_result z async_=True); kolejne zapisy
+# wykonywane są w kolejności zlecenia
+_SAVE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
 
+# Obrazy w kolejności RGB do figury matplotlib: id obrazu BGR -> (szerokość, obraz RGB)
+_rgb_cache = {}
 
-def display_results(original_image, processed_image, triangulator):
+
+def display_results(original_image, processed_image, triangulator, use_matplotlib=False,
+                    show=True, output_path="wyniki_triangulacji.png"):
     """
-    Wyświetla porównanie oryginalnego obrazu z obrazem po triangulacji
-    używając matplotlib.
+    Wyświetla porównanie oryginalnego obrazu z obrazem po triangulacji.
+
+    Domyślnie obrazy są zestawiane obok siebie i pokazywane w oknie OpenCV
+    (bez konwersji kolorów i tworzenia figury matplotlib). Figura matplotlib
+    korzysta z widoku obrazu z triangulacją w kolejności RGB, dlatego nie należy
+    go modyfikować, dopóki jest wyświetlana. Wersja RGB oryginalnego obrazu jest
+    zapamiętywana do kolejnych wywołań - oryginał nie powinien się zmieniać.
 
     Args:
         original_image (numpy.ndarray): Oryginalny obraz w formacie BGR
         processed_image (numpy.ndarray): Obraz z triangulacją w formacie BGR
         triangulator (ImageTriangulation): Instancja triangulacji z parametrami
+        use_matplotlib (bool): True aby wyświetlić wyniki w oknie matplotlib
+        show (bool): False aby zamiast wyświetlania zapisać porównanie do pliku (bez okna;
+            figura matplotlib jest tworzona bez pyplot)
+        output_path (str): Ścieżka pliku, do którego zapisywane jest porównanie gdy show=False
     """
-    # Utwórz nowe okno matplotlib z określonym rozmiarem
-    plt.figure(figsize=(15, 10))
+    if not use_matplotlib:
+        if show:
+            _display_results_cv2(original_image, processed_image, triangulator)
+        else:
+            # Obraz porównania zapisywany bez tworzenia figury
+            save_result(create_results_image(original_image, processed_image, triangulator),
+                        output_path)
+        return
+
+    if show:
+        # Okno matplotlib wymaga figury zarejestrowanej w pyplot
+        import matplotlib.pyplot as plt
+        fig = plt.figure(figsize=(15, 10))
+    else:
+        # Figura bez pyplot i interfejsu graficznego - zapis do pliku rysuje ją
+        # domyślnym rendererem Agg
+        from matplotlib.figure import Figure
+        fig = Figure(figsize=(15, 10))
+
+    # Obie osie tworzone jednym wywołaniem (1 rząd, 2 kolumny)
+    ax_original, ax_processed = fig.subplots(1, 2)
+
+    # Każdy obraz zajmuje około połowy szerokości figury - znacznie większe obrazy
+    # zmniejsz przed rysowaniem, aby matplotlib nie przetwarzał zbędnych pikseli
+    target_width = int(fig.get_figwidth() * fig.dpi / 2)
+    processed_image = _shrink_to_width(processed_image, target_width)
+
+    # Pierwszy obraz - oryginalny obraz
+    # Oryginał nie zmienia się między wywołaniami, więc jego wersja RGB jest zapamiętywana
+    ax_original.imshow(_cached_rgb(original_image, target_width))
+    ax_original.set_title("Oryginalny obraz", fontsize=14, fontweight='bold')
+    ax_original.set_axis_off()  # Ukryj osie współrzędnych
+
+    # Drugi obraz - obraz z triangulacją
+    # Kanały BGR (OpenCV) podawane w odwrotnej kolejności jako RGB (matplotlib) -
+    # widok tablicy zamiast kopii, więc obrazu nie wolno zmieniać przed narysowaniem
+    ax_processed.imshow(processed_image[..., ::-1])
+    # Tytuł z informacjami o parametrach triangulacji
+    ax_processed.set_title(f"Triangulacja Delaunaya\n"
+                           f"Punkty konturu: {triangulator.n_contour_points}, "
+                           f"Gęstość: {triangulator.interior_density}",
+                           fontsize=14, fontweight='bold')
+    ax_processed.set_axis_off()  # Ukryj osie współrzędnych
 
-    # Pierwszy subplot - oryginalny obraz
-    plt.subplot(1, 2, 1)  # 1 rząd, 2 kolumny, pierwszy obraz
-    # Konwertuj z BGR (OpenCV) na RGB (matplotlib) do poprawnego wyświetlania kolorów
-    plt.imshow(cv2.cvtColor(original_image, cv2.COLOR_BGR2RGB))
-    plt.title("Oryginalny obraz", fontsize=14, fontweight='bold')
-    plt.axis('off')  # Ukryj osie współrzędnych
+    # Dopasuj layout figury aby uniknąć nakładania się elementów
+    fig.tight_layout()
 
-    # Drugi subplot - obraz z triangulacją
-    plt.subplot(1, 2, 2)  # 1 rząd, 2 kolumny, drugi obraz
-    # Konwertuj z BGR na RGB
-    plt.imshow(cv2.cvtColor(processed_image, cv2.COLOR_BGR2RGB))
-    # Tytuł z informacjami o parametrach triangulacji
-    plt.title(f"Triangulacja Delaunaya\n"
-              f"Punkty konturu: {triangulator.n_contour_points}, "
-              f"Gęstość: {triangulator.interior_density}",
-              fontsize=14, fontweight='bold')
-    plt.axis('off')  # Ukryj osie współrzędnych
+    if show:
+        # Wyświetl okno z wynikami
+        plt.show()
+    else:
+        # Zapisz figurę do pliku (figura spoza pyplot jest zwalniana razem z obiektem)
+        fig.savefig(output_path)
+        print(f"Wyniki zapisane do: {output_path}")
+
+
+def _cached_rgb(image, target_width):
+    """
+    Zwraca zapamiętaną ciągłą kopię obrazu w kolejności RGB, zmniejszoną do wyświetlania.
+
+    Kopia jest usuwana z pamięci podręcznej razem z obrazem źródłowym.
+
+    Args:
+        image (numpy.ndarray): Obraz w formacie BGR (niezmieniany po pierwszym wywołaniu)
+        target_width (int): Szerokość, z jaką obraz będzie wyświetlany
+
+    Returns:
+        numpy.ndarray: Obraz w formacie RGB
+    """
+    key = id(image)
+    entry = _rgb_cache.get(key)
+    if entry is not None and entry[0] == target_width:
+        return entry[1]
+
+    rgb = np.ascontiguousarray(_shrink_to_width(image, target_width)[..., ::-1])
+    if entry is None:
+        # Usuń wpis, gdy obraz źródłowy zostanie zwolniony (jego id może zostać ponownie użyte)
+        weakref.finalize(image, _rgb_cache.pop, key, None)
+    _rgb_cache[key] = (target_width, rgb)
+    return rgb
+
+
+def _shrink_to_width(image, target_width):
+    """
+    Zmniejsza obraz ponad dwukrotnie szerszy niż docelowa szerokość.
+
+    Args:
+        image (numpy.ndarray): Obraz
+        target_width (int): Szerokość, z jaką obraz będzie wyświetlany
+
+    Returns:
+        numpy.ndarray: Obraz zmniejszony do target_width (z zachowaniem proporcji)
+        lub oryginalny obraz
+    """
+    height, width = image.shape[:2]
+    if width <= 2 * target_width:
+        return image
+    return cv2.resize(image, (target_width, max(1, target_width * height // width)),
+                      interpolation=cv2.INTER_AREA)
+
+
+def create_results_image(original_image, processed_image, triangulator):
+    """
+    Tworzy jeden obraz z oryginałem i wynikiem triangulacji obok siebie oraz tytułami.
+
+    Args:
+        original_image (numpy.ndarray): Oryginalny obraz w formacie BGR
+        processed_image (numpy.ndarray): Obraz z triangulacją w formacie BGR
+        triangulator (ImageTriangulation): Instancja triangulacji z parametrami
 
-    # Dopasuj layout aby uniknąć nakładania się elementów
-    plt.tight_layout()
+    Returns:
+        numpy.ndarray: Obraz porównania w formacie BGR
+    """
+    # Dopasuj wysokość obrazu wynikowego, aby można je było połączyć poziomo
+    height, original_width = original_image.shape[:2]
+    if processed_image.shape[0] != height:
+        scale = height / processed_image.shape[0]
+        processed_image = cv2.resize(processed_image,
+                                     (int(processed_image.shape[1] * scale), height))
+
+    # Jeden bufor na pasek z tytułami (40 px) i oba obrazy obok siebie - obrazy
+    # kopiowane są bezpośrednio na swoje miejsca
+    title_height = 40
+    combined = np.full((title_height + height, original_width + processed_image.shape[1], 3),
+                       255, dtype=np.uint8)
+    combined[title_height:, :original_width] = original_image
+    combined[title_height:, original_width:] = processed_image
+
+    # Tytuły (czcionki OpenCV nie obsługują polskich znaków)
+    cv2.putText(combined, "Oryginalny obraz", (10, 28),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
+    cv2.putText(combined,
+                f"Triangulacja Delaunaya - punkty konturu: {triangulator.n_contour_points}, "
+                f"gestosc: {triangulator.interior_density}",
+                (original_width + 10, 28), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 0), 2)
+
+    return combined
+
+
+def _display_results_cv2(original_image, processed_image, triangulator):
+    """
+    Wyświetla porównanie obrazów w oknie OpenCV i czeka na dowolny klawisz.
+
+    Args:
+        original_image (numpy.ndarray): Oryginalny obraz w formacie BGR
+        processed_image (numpy.ndarray): Obraz z triangulacją w formacie BGR
+        triangulator (ImageTriangulation): Instancja triangulacji z parametrami
+    """
+    combined = create_results_image(original_image, processed_image, triangulator)
 
-    # Wyświetl okno z wynikami
-    plt.show()
+    # Wyświetl okno z wynikami i czekaj na naciśnięcie klawisza
+    window_name = "Wyniki triangulacji"
+    cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
+    cv2.imshow(window_name, combined)
+    cv2.waitKey(0)
+    cv2.destroyWindow(window_name)
 
 
-def save_result(processed_image, output_path):
+def save_result(processed_image, output_path, *, jpeg_quality=95, png_compression=1,
+                async_=False):
     """
     Zapisuje przetworzony obraz do pliku.
 
     Args:
         processed_image (numpy.ndarray): Obraz do zapisania
         output_path (str): Ścieżka do pliku wynikowego
+        jpeg_quality (int): Jakość zapisu JPEG (0-100, domyślnie jak w OpenCV)
+        png_compression (int): Poziom kompresji PNG (0-9, niższy - szybszy zapis)
+        async_ (bool): True aby zapisać kopię obrazu w wątku w tle bez czekania na wynik
+
+    Returns:
+        bool: True jeśli zapis się powiódł, False w przeciwnym razie
+        (przy async_=True - concurrent.futures.Future z tym wynikiem)
+    """
+    params = _imwrite_params(output_path, jpeg_quality, png_compression)
+
+    if async_:
+        # Kopia obrazu, aby wywołujący mógł dalej zmieniać swój bufor podczas zapisu;
+        # kodowanie w OpenCV zwalnia GIL, więc interfejs nie czeka na zapis
+        return _SAVE_POOL.submit(_write_image, processed_image.copy(), output_path, params)
+
+    return _write_image(processed_image, output_path, params)
+
+
+def wait_for_saves():
+    """
+    Czeka na zakończenie wszystkich zapisów zleconych w tle (save_result z async_=True).
+    Po wywołaniu nie można zlecać kolejnych zapisów w tle.
+    """
+    _SAVE_POOL.shutdown(wait=True)
+
+
+def _write_image(image, output_path, params):
+    """
+    Zapisuje obraz do pliku i wyświetla komunikat o wyniku.
+
+    Args:
+        image (numpy.ndarray): Obraz do zapisania
+        output_path (str): Ścieżka do pliku wynikowego
+        params (list): Parametry cv2.imwrite
 
     Returns:
         bool: True jeśli zapis się powiódł, False w przeciwnym razie
     """
     try:
         # Zapisz obraz używając OpenCV
-        success = cv2.imwrite(output_path, processed_image)
+        success = cv2.imwrite(output_path, image, params)
 
         if success:
             print(f"Wynik zapisany pomyślnie do: {output_path}")
@@ -71,11 +269,29 @@ def save_result(processed_image, output_path):
         return False
 
 
-def print_help():
+def _imwrite_params(output_path, jpeg_quality, png_compression):
     """
-    Wyświetla pomoc dotyczącą obsługi aplikacji.
+    Zwraca parametry cv2.imwrite odpowiednie dla formatu pliku.
+
+    Args:
+        output_path (str): Ścieżka do pliku wynikowego
+        jpeg_quality (int): Jakość zapisu JPEG
+        png_compression (int): Poziom kompresji PNG
+
+    Returns:
+        list: Pary (flaga, wartość) jako liczby całkowite - OpenCV nie akceptuje wartości bool
     """
-    help_text = """
+    extension = os.path.splitext(output_path)[1].lower()
+    if extension == '.png':
+        return [int(cv2.IMWRITE_PNG_COMPRESSION), int(png_compression)]
+    if extension in ('.jpg', '.jpeg'):
+        return [int(cv2.IMWRITE_JPEG_QUALITY), int(jpeg_quality),
+                int(cv2.IMWRITE_JPEG_OPTIMIZE), 1]
+    return []
+
+
+# Tekst pomocy (gotowy napis wypisywany jednym wywołaniem write)
+_HELP_TEXT = """
     === KOLOROWANKA Z TRIANGULACJĄ DELAUNAYA ===
 
     STEROWANIE:
@@ -88,6 +304,7 @@ def print_help():
     Klawiatura:
     - ESC          : Zamknij aplikację
     - R            : Resetuj kolorowanie (przywróć oryginalny obraz)
+    - U            : Cofnij ostatnie kolorowanie trójkąta
     - S            : Zapisz aktualny stan kolorowanki do pliku
     - D            : Pokaż/ukryj okno kontroli gęstości siatki
     - + (lub =)    : Zwiększ gęstość siatki triangulacji
@@ -108,8 +325,42 @@ def print_help():
     - Gęstość wewnętrzna : Gęstość punktów wewnątrz obszaru (2-20)
 
     Im większe wartości, tym gęstsza siatka triangulacji.
+    
+"""
+
+
+def print_help():
     """
-    print(help_text)
+    Wyświetla pomoc dotyczącą obsługi aplikacji.
+    """
+    sys.stdout.write(_HELP_TEXT)
+
+
+def encode_ppm_bytes(image):
+    """
+    Koduje obraz do formatu PPM (P6) lub PGM (P5) w pamięci, bez kompresji.
+
+    Szybka alternatywa dla cv2.imencode('.png', ...) do podglądów w pamięci
+    (format PPM wczytuje m.in. Tk i Qt) - zamiast kompresji tylko nagłówek
+    i jedno skopiowanie danych obrazu.
+
+    Args:
+        image (numpy.ndarray): Obraz uint8 w formacie BGR (h, w, 3) lub w skali szarości (h, w)
+
+    Returns:
+        bytes: Zakodowany obraz
+    """
+    height, width = image.shape[:2]
+    if image.ndim == 2:
+        return b'P5\n%d %d\n255\n' % (width, height) + image.tobytes()
+
+    # PPM przechowuje piksele w kolejności RGB (tobytes tworzy ciągłą kopię widoku)
+    return b'P6\n%d %d\n255\n' % (width, height) + image[..., ::-1].tobytes()
+
+
+# Obsługiwane rozszerzenia plików obrazów (krotka do komunikatów, zbiór do sprawdzania)
+_VALID_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif')
+_VALID_EXTENSIONS_SET = frozenset(_VALID_EXTENSIONS)
 
 
 def validate_image_path(image_path):
@@ -122,35 +373,42 @@ def validate_image_path(image_path):
     Returns:
         bool: True jeśli ścieżka jest prawidłowa, False w przeciwnym razie
     """
-    import os
-
     # Sprawdź czy ścieżka nie jest pusta
     if not image_path:
         print("Błąd: Nie podano ścieżki do obrazu")
         return False
 
-    # Sprawdź czy plik istnieje
-    if not os.path.exists(image_path):
+    # Sprawdź czy plik istnieje (jedno wywołanie stat zamiast exists + isfile)
+    try:
+        mode = os.stat(image_path).st_mode
+    except OSError:
         print(f"Błąd: Plik {image_path} nie istnieje")
         return False
 
     # Sprawdź czy to jest plik (a nie katalog)
-    if not os.path.isfile(image_path):
+    if not stat.S_ISREG(mode):
         print(f"Błąd: {image_path} nie jest plikiem")
         return False
 
     # Sprawdź rozszerzenie pliku
-    valid_extensions = ['.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif']
     file_extension = os.path.splitext(image_path)[1].lower()
 
-    if file_extension not in valid_extensions:
+    if file_extension not in _VALID_EXTENSIONS_SET:
         print(f"Błąd: Nieobsługiwane rozszerzenie pliku {file_extension}")
-        print(f"Obsługiwane formaty: {', '.join(valid_extensions)}")
+        print(f"Obsługiwane formaty: {', '.join(_VALID_EXTENSIONS)}")
         return False
 
     return True
 
 
+# Zakresy parametrów triangulacji: (minimum, maksimum, nazwa w komunikatach,
+# komunikat dla wartości niebędącej liczbą całkowitą)
+_PARAM_SPECS = (
+    (3, 200, "Liczba punktów konturu", "Liczba punktów konturu musi być liczbą całkowitą"),
+    (1, 50, "Gęstość wewnętrzna", "Gęstość wewnętrzna musi być liczbą całkowitą"),
+)
+
+
 def validate_parameters(n_contour_points, interior_density):
     """
     Sprawdza czy parametry triangulacji są w prawidłowych zakresach.
@@ -162,27 +420,47 @@ def validate_parameters(n_contour_points, interior_density):
     Returns:
         tuple: (bool, str) - (czy_prawidłowe, komunikat_błędu)
     """
-    # Sprawdź punkty konturu
-    if not isinstance(n_contour_points, int):
-        return False, "Liczba punktów konturu musi być liczbą całkowitą"
-
-    if n_contour_points < 3:
-        return False, "Liczba punktów konturu musi być co najmniej 3"
+    for value, (minimum, maximum, name, type_message) in zip(
+            (n_contour_points, interior_density), _PARAM_SPECS):
+        # operator.index sprawdza jednym wywołaniem, czy wartość jest liczbą całkowitą
+        # (także liczbą całkowitą NumPy)
+        try:
+            value = operator.index(value)
+        except TypeError:
+            return False, type_message
 
-    if n_contour_points > 200:
-        return False, "Liczba punktów konturu nie może przekraczać 200"
+        if value < minimum:
+            return False, f"{name} musi być co najmniej {minimum}"
 
-    # Sprawdź gęstość wewnętrzną
-    if not isinstance(interior_density, int):
-        return False, "Gęstość wewnętrzna musi być liczbą całkowitą"
+        if value > maximum:
+            return False, f"{name} nie może przekraczać {maximum}"
 
-    if interior_density < 1:
-        return False, "Gęstość wewnętrzna musi być co najmniej 1"
+    return True, "Parametry są prawidłowe"
 
-    if interior_density > 50:
-        return False, "Gęstość wewnętrzna nie może przekraczać 50"
 
-    return True, "Parametry są prawidłowe"
+# Słownik podstawowych kolorów (BGR -> nazwa)
+_COLOR_NAMES = {
+    (255, 0, 0): "Czerwony",
+    (0, 255, 0): "Zielony",
+    (0, 0, 255): "Niebieski",
+    (255, 255, 0): "Cyan",
+    (255, 0, 255): "Magenta",
+    (0, 255, 255): "Żółty",
+    (0, 165, 255): "Pomarańczowy",
+    (128, 0, 128): "Fioletowy",
+    (0, 0, 0): "Czarny",
+    (255, 255, 255): "Biały",
+    (128, 128, 128): "Szary",
+    (0, 69, 255): "Czerwono-pomarańczowy",
+    (75, 0, 130): "Indygo",
+    (165, 42, 42): "Brązowy",
+    (192, 192, 192): "Srebrny",
+    (0, 215, 255): "Złoty"
+}
+
+# Ten sam słownik z kluczami w postaci jednej liczby B | G << 8 | R << 16
+_COLOR_NAMES_PACKED = {b | (g << 8) | (r << 16): name
+                       for (b, g, r), name in _COLOR_NAMES.items()}
 
 
 def get_color_name(color_bgr):
@@ -190,55 +468,44 @@ def get_color_name(color_bgr):
     Zwraca nazwę koloru na podstawie wartości BGR.
 
     Args:
-        color_bgr (tuple): Kolor w formacie BGR (B, G, R)
+        color_bgr (tuple): Kolor w formacie BGR (B, G, R) - krotka, lista lub tablica NumPy
 
     Returns:
         str: Nazwa koloru lub opis RGB
     """
-    # Słownik podstawowych kolorów (BGR -> nazwa)
-    color_names = {
-        (255, 0, 0): "Czerwony",
-        (0, 255, 0): "Zielony",
-        (0, 0, 255): "Niebieski",
-        (255, 255, 0): "Cyan",
-        (255, 0, 255): "Magenta",
-        (0, 255, 255): "Żółty",
-        (0, 165, 255): "Pomarańczowy",
-        (128, 0, 128): "Fioletowy",
-        (0, 0, 0): "Czarny",
-        (255, 255, 255): "Biały",
-        (128, 128, 128): "Szary",
-        (0, 69, 255): "Czerwono-pomarańczowy",
-        (75, 0, 130): "Indygo",
-        (165, 42, 42): "Brązowy",
-        (192, 192, 192): "Srebrny",
-        (0, 215, 255): "Złoty"
-    }
+    # Składowe jako liczby Pythona (działa także dla tablic i skalarów NumPy)
+    b, g, r = int(color_bgr[0]), int(color_bgr[1]), int(color_bgr[2])
 
     # Sprawdź czy kolor jest w słowniku
-    if color_bgr in color_names:
-        return color_names[color_bgr]
+    name = _COLOR_NAMES_PACKED.get(b | (g << 8) | (r << 16))
+    if name is not None:
+        return name
 
     # Jeśli nie ma w słowniku, zwróć opis RGB
-    b, g, r = color_bgr
     return f"RGB({r}, {g}, {b})"
 
 
+_matplotlib_polish_done = False  # Czy matplotlib został już skonfigurowany
+
+
 def setup_matplotlib_polish():
     """
-    Konfiguruje matplotlib do wyświetlania polskich znaków.
+    Konfiguruje matplotlib do wyświetlania polskich znaków (tylko raz na proces).
     """
+    global _matplotlib_polish_done
+    if _matplotlib_polish_done:
+        return
+
     try:
         import matplotlib
-        # Ustaw czcionkę obsługującą polskie znaki
-        matplotlib.rcParams['font.family'] = ['DejaVu Sans', 'Liberation Sans', 'Arial']
-        matplotlib.rcParams['axes.unicode_minus'] = False
-
-        # Jeśli dostępna jest czcionka z polskimi znakami
-        try:
-            plt.rcParams['font.sans-serif'] = ['DejaVu Sans', 'Arial Unicode MS', 'Tahoma']
-        except:
-            pass
+        # Ustaw czcionki obsługujące polskie znaki jednym wywołaniem (plt.rcParams
+        # to ten sam słownik, więc wystarczy jedna aktualizacja)
+        matplotlib.rcParams.update({
+            'font.family': ['DejaVu Sans', 'Liberation Sans', 'Arial'],
+            'font.sans-serif': ['DejaVu Sans', 'Arial Unicode MS', 'Tahoma'],
+            'axes.unicode_minus': False,
+        })
+        _matplotlib_polish_done = True
 
     except ImportError:
         print("Uwaga: Nie można skonfigurować matplotlib dla polskich znaków")
@@ -255,8 +522,6 @@ def create_color_palette_image(colors, selected_index=0):
     Returns:
         numpy.ndarray: Obraz palety kolorów
     """
-    import numpy as np
-
     # Parametry palety
     color_width = 60
     color_height = 60
@@ -268,27 +533,35 @@ def create_color_palette_image(colors, selected_index=0):
     palette_width = colors_per_row * color_width
     palette_height = rows * color_height
 
-    # Utwórz białe tło
-    palette_image = np.ones((palette_height, palette_width, 3), dtype=np.uint8) * 255
+    # Kolory uzupełnione białymi polami do pełnego prostokąta rows x colors_per_row
+    cells = np.full((rows * colors_per_row, 3), 255, dtype=np.uint8)
+    cells[:len(colors)] = np.asarray(colors, dtype=np.uint8).reshape(-1, 3)
 
-    # Narysuj kolory
-    for i, color in enumerate(colors):
-        row = i // colors_per_row
-        col = i % colors_per_row
+    # Wypełnij wszystkie pola jednym przypisaniem: widok obrazu jako
+    # (wiersz, wysokość pola, kolumna, szerokość pola, kanał) i kolor każdego pola
+    palette_image = np.empty((palette_height, palette_width, 3), dtype=np.uint8)
+    palette_image.reshape(rows, color_height, colors_per_row, color_width, 3)[...] = \
+        cells.reshape(rows, 1, colors_per_row, 1, 3)
 
-        x_start = col * color_width
+    # Szare linie siatki wokół pól z kolorami (krawędzie pól są wspólne)
+    grid_color = (128, 128, 128)
+    for row in range(rows):
         y_start = row * color_height
-        x_end = x_start + color_width
-        y_end = y_start + color_height
-
-        # Narysuj kolor
-        cv2.rectangle(palette_image, (x_start, y_start), (x_end, y_end), color, -1)
-
-        # Dodaj ramkę
-        border_color = (0, 0, 0) if i == selected_index else (128, 128, 128)
-        border_thickness = 3 if i == selected_index else 1
-        cv2.rectangle(palette_image, (x_start, y_start), (x_end, y_end),
-                      border_color, border_thickness)
+        row_count = min(colors_per_row, len(colors) - row * colors_per_row)
+        # Krawędź pozioma ponad wierszem sięga do ostatniego pola tego lub poprzedniego wiersza
+        line_count = colors_per_row if row > 0 else row_count
+        palette_image[y_start, :line_count * color_width + 1] = grid_color
+        # Krawędzie pionowe pól wiersza (co color_width pikseli, łącznie z prawą krawędzią
+        # ostatniego pola) z dolną krawędzią wiersza
+        palette_image[y_start:y_start + color_height + 1,
+                      :row_count * color_width + 1:color_width] = grid_color
+
+    # Pogrubiona ramka wybranego koloru
+    if 0 <= selected_index < len(colors):
+        x_start = (selected_index % colors_per_row) * color_width
+        y_start = (selected_index // colors_per_row) * color_height
+        cv2.rectangle(palette_image, (x_start, y_start),
+                      (x_start + color_width, y_start + color_height), (0, 0, 0), 3)
 
     return palette_image
 
@@ -297,25 +570,45 @@ def log_action(action, details=""):
     """
     Loguje akcje użytkownika do celów debugowania.
 
+    Komunikaty trafiają do dziennika "kolorowanka" (widoczne po uruchomieniu
+    z opcją -v / --verbose, czas dodaje formatowanie dziennika); gdy dziennik
+    jest wyłączony, funkcja nic nie formatuje.
+
     Args:
         action (str): Nazwa akcji
         details (str): Dodatkowe szczegóły
     """
-    import datetime
-
-    timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-    log_message = f"[{timestamp}] {action}"
+    if not _logger.isEnabledFor(logging.DEBUG):
+        return
 
     if details:
-        log_message += f" - {details}"
+        _logger.debug("%s - %s", action, details)
+    else:
+        _logger.debug("%s", action)
+
+
+# Wersja OpenCV jako krotka liczb (major, minor, patch) - odczytana raz przy imporcie
+_CV_VER = tuple(int(part) for part in re.findall(r"\d+", cv2.__version__)[:3])
+
 
-    print(log_message)
+def opencv_compatible():
+    """
+    Sprawdza bez wyświetlania komunikatów, czy wersja OpenCV jest wystarczająca.
+
+    Returns:
+        bool: True jeśli wersja jest kompatybilna (minimum 4.0.0)
+    """
+    return _CV_VER >= (4, 0, 0)
 
 
+@functools.lru_cache(maxsize=1)
 def check_opencv_version():
     """
     Sprawdza wersję OpenCV i wyświetla informacje o kompatybilności.
 
+    Wynik jest zapamiętywany - komunikaty wyświetlane są tylko przy pierwszym
+    wywołaniu (do sprawdzeń bez komunikatów służy opencv_compatible).
+
     Returns:
         bool: True jeśli wersja jest kompatybilna
     """
@@ -324,10 +617,7 @@ def check_opencv_version():
         print(f"Wersja OpenCV: {opencv_version}")
 
         # Sprawdź czy wersja jest wystarczająca (minimum 4.0.0)
-        version_parts = opencv_version.split('.')
-        major_version = int(version_parts[0])
-
-        if major_version >= 4:
+        if opencv_compatible():
             print("✓ Wersja OpenCV jest kompatybilna")
             return True
         else:
@@ -340,12 +630,17 @@ def check_opencv_version():
         return False
 
 
-def estimate_processing_time(image_shape, n_contour_points, interior_density):
+@functools.lru_cache(maxsize=64)
+def estimate_processing_time(height, width, n_contour_points, interior_density):
     """
     Szacuje czas przetwarzania obrazu na podstawie jego rozmiaru i parametrów.
 
+    Parametry zmieniają się rzadko (tylko przy zmianie obrazu lub gęstości siatki),
+    więc wyniki są zapamiętywane dla kolejnych wywołań z tymi samymi wartościami.
+
     Args:
-        image_shape (tuple): Kształt obrazu (wysokość, szerokość)
+        height (int): Wysokość obrazu (image.shape[0])
+        width (int): Szerokość obrazu (image.shape[1])
         n_contour_points (int): Liczba punktów na konturze
         interior_density (int): Gęstość punktów wewnętrznych
 
@@ -353,7 +648,6 @@ def estimate_processing_time(image_shape, n_contour_points, interior_density):
         float: Szacowany czas w sekundach
     """
     # Podstawowe szacowanie na podstawie rozmiaru obrazu i liczby punktów
-    height, width = image_shape[:2]
     total_pixels = height * width
 
     # Szacowana liczba punktów do triangulacji